@@ -3,9 +3,82 @@ Sistema de filtros avanzados para cartas.
 Interfaz profesional con colores y símbolos.
 """
 
-from typing import Dict, List, Set
+import re
+import sys
+from typing import Dict, List, NamedTuple, Set, Tuple
 from collections import Counter
+from functools import reduce
+from operator import or_
 from colorama import Fore, Style, Back
+from rapidfuzz import fuzz, process
+
+from console_input import read_choice
+from scryfall_api import TYPE_PRIORITY
+
+# Bit de cada tipo para filtrar con una sola operación AND
+TYPE_BITS = {card_type: 1 << i for i, card_type in enumerate(TYPE_PRIORITY)}
+
+# Bit de cada color (C = incoloro) para filtrar por color con enteros
+COLOR_BITS = {color: 1 << i for i, color in enumerate('WUBRGC')}
+
+
+def _color_sort_string(color_bits: int) -> str:
+    """Clave del orden por color: colores en orden alfabético, incoloro al final."""
+    if color_bits & COLOR_BITS['C']:
+        return 'Z'
+    return ''.join(c for c in sorted('WUBRG') if color_bits & COLOR_BITS[c])
+
+
+# Posición en el orden por color de cada combinación de bits de color
+_COLOR_SORT_STRINGS = [_color_sort_string(bits) for bits in range(1 << len(COLOR_BITS))]
+COLOR_SORT_RANK = tuple(sorted(set(_COLOR_SORT_STRINGS)).index(key)
+                        for key in _COLOR_SORT_STRINGS)
+
+# Símbolo con color para cada tipo de maná
+_COLOR_SYMBOL = {
+    'W': f'{Fore.LIGHTYELLOW_EX}☀️  Blanco{Style.RESET_ALL}',
+    'U': f'{Fore.BLUE}💧 Azul{Style.RESET_ALL}',
+    'B': f'{Fore.LIGHTBLACK_EX}💀 Negro{Style.RESET_ALL}',
+    'R': f'{Fore.RED}🔥 Rojo{Style.RESET_ALL}',
+    'G': f'{Fore.GREEN}🌳 Verde{Style.RESET_ALL}',
+    'C': f'{Fore.WHITE}◇  Incoloro{Style.RESET_ALL}'
+}
+
+# Icono para cada tipo de carta
+_TYPE_ICON = {
+    'Land': '🏔️ ',
+    'Creature': '🐉',
+    'Instant': '⚡',
+    'Sorcery': '📜',
+    'Artifact': '⚙️ ',
+    'Enchantment': '✨',
+    'Planeswalker': '👤'
+}
+
+# Icono por rango de tipo principal (sin tipo reconocido = sin icono)
+_TYPE_ICON_BY_RANK = tuple(_TYPE_ICON[t] for t in TYPE_PRIORITY) + ('',)
+
+# Búsqueda aproximada: largo mínimo del texto y puntaje mínimo (0-100)
+FUZZY_MIN_LENGTH = 5
+FUZZY_SCORE_CUTOFF = 80
+
+# Separador de varios términos de búsqueda (no aparece en nombres de cartas,
+# a diferencia de la coma: "Omnath, Locus of the Roil")
+SEARCH_TERM_SEPARATOR = ';'
+
+# Posición alfabética de cada tipo principal (el último índice es "sin tipo")
+TYPE_SORT_RANK = tuple(sorted(TYPE_PRIORITY).index(t) for t in TYPE_PRIORITY) + (len(TYPE_PRIORITY),)
+
+
+class CardEntry(NamedTuple):
+    """Datos precalculados de una carta para filtrar y ordenar."""
+    name: str
+    color_bits: int
+    type_bits: int
+    name_lower: str
+    cmc: float
+    type_rank: int
+    is_land: bool
 
 
 class CardFilter:
@@ -21,6 +94,9 @@ class CardFilter:
         self.cards_data = cards_data
         self.deck_list = deck_list
         
+        # Copias de cada carta: los filtros se evalúan una vez por carta única
+        self._counts = Counter(deck_list)
+        
         # Filtros activos
         self.active_filters = {
             'colors': set(),
@@ -29,6 +105,45 @@ class CardFilter:
             'search_text': '',
             'sort_by': 'name'  # name, cmc_asc, cmc_desc, color, type
         }
+        
+        # Índice precalculado para no releer cards_data en cada filtrado
+        self._index = self._build_index()
+        self._index_by_name = {entry.name: entry for entry in self._index}
+        self._names_lower = list(dict.fromkeys(entry.name_lower for entry in self._index))
+        
+        # Resultados ya filtrados y ordenados, por estado de filtros
+        self._cache: Dict[Tuple, Tuple[List[str], Dict]] = {}
+    
+    def _build_index(self) -> List[CardEntry]:
+        """
+        Precalcula los datos que usan los filtros para cada carta única del mazo.
+        
+        Returns:
+            Lista de CardEntry (solo cartas con datos de Scryfall)
+        """
+        index = []
+        
+        for card_name in self._counts:
+            card_info = self.cards_data.get(card_name, {})
+            
+            if not card_info or 'error' in card_info:
+                continue
+            
+            type_line = card_info.get('type_line', '')
+            color_bits = 0
+            for color in card_info.get('color_identity') or ('C',):  # Incoloro
+                color_bits |= COLOR_BITS.get(color, 0)
+            type_bits = 0
+            for card_type in TYPE_PRIORITY:
+                if card_type in type_line:
+                    type_bits |= TYPE_BITS[card_type]
+            type_rank = card_info.get('type_rank', len(TYPE_PRIORITY))
+            
+            index.append(CardEntry(card_name, color_bits, type_bits, card_name.lower(),
+                                   card_info.get('cmc', 0), type_rank,
+                                   card_info.get('is_land', False)))
+        
+        return index
     
     def _print_header(self, title: str):
         """Imprime un header bonito."""
@@ -44,28 +159,11 @@ class CardFilter:
     
     def _get_color_symbol(self, color: str) -> str:
         """Retorna símbolo y color para cada tipo de maná."""
-        symbols = {
-            'W': f'{Fore.LIGHTYELLOW_EX}☀️  Blanco{Style.RESET_ALL}',
-            'U': f'{Fore.BLUE}💧 Azul{Style.RESET_ALL}',
-            'B': f'{Fore.LIGHTBLACK_EX}💀 Negro{Style.RESET_ALL}',
-            'R': f'{Fore.RED}🔥 Rojo{Style.RESET_ALL}',
-            'G': f'{Fore.GREEN}🌳 Verde{Style.RESET_ALL}',
-            'C': f'{Fore.WHITE}◇  Incoloro{Style.RESET_ALL}'
-        }
-        return symbols.get(color, color)
+        return _COLOR_SYMBOL.get(color, color)
     
     def _get_type_icon(self, card_type: str) -> str:
         """Retorna icono para cada tipo de carta."""
-        icons = {
-            'Land': '🏔️ ',
-            'Creature': '🐉',
-            'Instant': '⚡',
-            'Sorcery': '📜',
-            'Artifact': '⚙️ ',
-            'Enchantment': '✨',
-            'Planeswalker': '👤'
-        }
-        return icons.get(card_type, '📄')
+        return _TYPE_ICON.get(card_type, '📄')
     
     def show_active_filters(self):
         """Muestra los filtros actualmente activos."""
@@ -118,14 +216,14 @@ class CardFilter:
         print(f"  {Fore.GREEN}[G]{Style.RESET_ALL} 🌳 Verde")
         print(f"  {Fore.WHITE}[C]{Style.RESET_ALL} ◇  Incoloro")
         
-        colors_input = input("\nIngresa letras separadas por coma (ej: U,B,R) o ENTER para saltar: ").strip().upper()
+        colors_input = read_choice("\nIngresa letras separadas por coma (ej: U,B,R) o ENTER para saltar: ").strip().upper()
         
         if colors_input:
             colors = set([c.strip() for c in colors_input.split(',') if c.strip() in ['W', 'U', 'B', 'R', 'G', 'C']])
             self.active_filters['colors'] = colors
             
             if len(colors) > 1:
-                mode = input("\n¿Modo? [1] Tiene TODOS estos colores (AND) / [2] Tiene AL MENOS UNO (OR): ").strip()
+                mode = read_choice("\n¿Modo? [1] Tiene TODOS estos colores (AND) / [2] Tiene AL MENOS UNO (OR): ").strip()
                 self.active_filters['color_mode'] = 'AND' if mode == '1' else 'OR'
             
             print(Fore.GREEN + f"\n✅ Filtro de color aplicado: {', '.join(colors)}" + Style.RESET_ALL)
@@ -146,7 +244,7 @@ class CardFilter:
         print(f"  [6] ✨ Encantamientos")
         print(f"  [7] 👤 Planeswalkers")
         
-        types_input = input("\nIngresa números separados por coma (ej: 1,2,5) o ENTER para saltar: ").strip()
+        types_input = read_choice("\nIngresa números separados por coma (ej: 1,2,5) o ENTER para saltar: ").strip()
         
         type_map = {
             '1': 'Land',
@@ -175,7 +273,7 @@ class CardFilter:
         """Búsqueda fuzzy por nombre."""
         self._print_section("🔍 BUSCAR POR NOMBRE")
         
-        search = input("\nIngresa texto a buscar (búsqueda flexible) o ENTER para saltar: ").strip()
+        search = read_choice(f"\nIngresa texto a buscar (búsqueda flexible, varios separados por '{SEARCH_TERM_SEPARATOR}') o ENTER para saltar: ").strip()
         
         if search:
             self.active_filters['search_text'] = search.lower()
@@ -195,7 +293,7 @@ class CardFilter:
         print("  [4] 🎨 Por color")
         print("  [5] 📦 Por tipo")
         
-        choice = input("\nElige opción: ").strip()
+        choice = read_choice("\nElige opción: ").strip()
         
         sort_map = {
             '1': 'name',
@@ -211,148 +309,175 @@ class CardFilter:
         else:
             print(Fore.RED + "\n❌ Opción inválida" + Style.RESET_ALL)
     
-    def _apply_filters(self) -> List[str]:
-        """Aplica todos los filtros activos y retorna lista de cartas."""
-        filtered_cards = []
+    def _apply_filters(self) -> Tuple[List[str], Dict]:
+        """
+        Aplica todos los filtros activos en una sola pasada.
         
-        for card_name in self.deck_list:
-            card_info = self.cards_data.get(card_name, {})
-            
-            if not card_info or 'error' in card_info:
-                continue
-            
+        Returns:
+            Tupla (lista de cartas sin duplicados, estadísticas de las cartas filtradas)
+        """
+        filtered_cards = []
+        counts = self._counts
+        total_cards = 0
+        nonland_cards = 0
+        total_cmc = 0
+        
+        color_mask = reduce(or_, (COLOR_BITS[c] for c in self.active_filters['colors']), 0)
+        color_mode_and = self.active_filters['color_mode'] == 'AND'
+        type_mask = reduce(or_, (TYPE_BITS[t] for t in self.active_filters['types']), 0)
+        search_text = self.active_filters['search_text']
+        search_matches = self._search_matches(search_text) if search_text else None
+        
+        for card_name, color_bits, type_bits, name_lower, cmc, _, is_land in self._index:
             # Filtro de colores
-            if self.active_filters['colors']:
-                card_colors = set(card_info.get('color_identity', []))
-                if not card_colors:
-                    card_colors = {'C'}  # Incoloro
-                
-                filter_colors = self.active_filters['colors']
-                
-                if self.active_filters['color_mode'] == 'AND':
+            if color_mask:
+                if color_mode_and:
                     # Debe tener TODOS los colores
-                    if not filter_colors.issubset(card_colors):
+                    if (color_bits & color_mask) != color_mask:
                         continue
                 else:  # OR
                     # Debe tener AL MENOS UNO
-                    if not filter_colors.intersection(card_colors):
+                    if not (color_bits & color_mask):
                         continue
             
             # Filtro de tipos
-            if self.active_filters['types']:
-                type_line = card_info.get('type_line', '')
-                card_matches_type = False
-                
-                for filter_type in self.active_filters['types']:
-                    if filter_type in type_line:
-                        card_matches_type = True
-                        break
-                
-                if not card_matches_type:
-                    continue
+            if type_mask and not (type_bits & type_mask):
+                continue
             
             # Búsqueda por texto
-            if self.active_filters['search_text']:
-                search_text = self.active_filters['search_text']
-                card_name_lower = card_name.lower()
-                
-                if search_text not in card_name_lower:
-                    continue
+            if search_matches is not None and name_lower not in search_matches:
+                continue
             
-            # Si pasó todos los filtros, agregar
+            # Si pasó todos los filtros, agregar y acumular estadísticas
             filtered_cards.append(card_name)
+            count = counts[card_name]
+            total_cards += count
+            if not is_land:
+                nonland_cards += count
+                total_cmc += cmc * count
+        
+        stats = {
+            'total_cards': total_cards,
+            'unique_cards': len(filtered_cards),
+            'avg_cmc': total_cmc / nonland_cards if nonland_cards else 0,
+        }
         
-        return filtered_cards
+        return filtered_cards, stats
     
     def _sort_cards(self, cards: List[str]) -> List[str]:
         """Ordena las cartas según el criterio seleccionado."""
         sort_by = self.active_filters['sort_by']
+        index = self._index_by_name
         
         if sort_by == 'name':
             return sorted(cards)
         
         elif sort_by == 'cmc_asc':
-            return sorted(cards, key=lambda c: self.cards_data.get(c, {}).get('cmc', 0))
+            return sorted(cards, key=lambda c: index[c].cmc)
         
         elif sort_by == 'cmc_desc':
-            return sorted(cards, key=lambda c: self.cards_data.get(c, {}).get('cmc', 0), reverse=True)
+            return sorted(cards, key=lambda c: index[c].cmc, reverse=True)
         
         elif sort_by == 'color':
-            def color_key(card):
-                colors = self.cards_data.get(card, {}).get('color_identity', [])
-                return ''.join(sorted(colors)) if colors else 'Z'
-            return sorted(cards, key=color_key)
+            return sorted(cards, key=lambda c: COLOR_SORT_RANK[index[c].color_bits])
         
         elif sort_by == 'type':
-            def type_key(card):
-                type_line = self.cards_data.get(card, {}).get('type_line', '')
-                for t in ['Land', 'Creature', 'Planeswalker', 'Artifact', 'Enchantment', 'Instant', 'Sorcery']:
-                    if t in type_line:
-                        return t
-                return 'ZZZ'
-            return sorted(cards, key=type_key)
+            return sorted(cards, key=lambda c: TYPE_SORT_RANK[index[c].type_rank])
         
         return cards
     
+    def _search_matches(self, search_text: str) -> Set[str]:
+        """
+        Busca nombres que coincidan con el texto (en minúsculas).
+        El texto puede tener varios términos separados por SEARCH_TERM_SEPARATOR;
+        basta con que coincida uno. Busca por subcadena exacta; un término largo que no
+        aparece en ningún nombre se busca aproximado (errores de tipeo).
+        
+        Returns:
+            Conjunto de nombres en minúsculas que coinciden
+        """
+        terms = [t.strip() for t in search_text.split(SEARCH_TERM_SEPARATOR) if t.strip()] or [search_text]
+        
+        # Todos los términos en un solo patrón: una pasada por nombre
+        pattern = re.compile('|'.join(map(re.escape, terms)))
+        matches = {name for name in self._names_lower if pattern.search(name)}
+        
+        for term in terms:
+            # Solo si la búsqueda exacta no encontró nada para este término
+            if len(term) >= FUZZY_MIN_LENGTH and not any(term in name for name in matches):
+                hits = process.extract(term, self._names_lower, scorer=fuzz.partial_ratio,
+                                       score_cutoff=FUZZY_SCORE_CUTOFF, limit=None)
+                matches.update(name for name, _, _ in hits)
+        
+        return matches
+    
+    def _filter_key(self) -> Tuple:
+        """Retorna una instantánea hashable de los filtros activos."""
+        filters = self.active_filters
+        return (frozenset(filters['colors']), filters['color_mode'],
+                frozenset(filters['types']), filters['search_text'], filters['sort_by'])
+    
+    def _get_results(self) -> Tuple[List[str], Dict]:
+        """
+        Retorna las cartas filtradas y ordenadas junto con sus estadísticas.
+        Reutiliza el resultado si los filtros no cambiaron desde la última vez.
+        """
+        key = self._filter_key()
+        results = self._cache.get(key)
+        
+        if results is None:
+            filtered, stats = self._apply_filters()
+            results = (self._sort_cards(filtered), stats)
+            self._cache[key] = results
+        
+        return results
+    
     def apply_and_show_results(self):
         """Aplica filtros y muestra resultados bonitos."""
         self._print_header("📋 RESULTADOS DE BÚSQUEDA")
         
-        # Aplicar filtros
-        filtered = self._apply_filters()
+        # Aplicar filtros y ordenar
+        sorted_cards, stats = self._get_results()
         
-        if not filtered:
+        if not sorted_cards:
             print(Fore.RED + "\n❌ No se encontraron cartas con estos filtros." + Style.RESET_ALL)
             return
         
-        # Ordenar
-        sorted_cards = self._sort_cards(filtered)
-        
-        # Contar repeticiones
-        card_counts = Counter(sorted_cards)
+        # Repeticiones de cada carta
+        card_counts = self._counts
         
-        # Calcular estadísticas
-        total_cards = len(sorted_cards)
-        unique_cards = len(card_counts)
-        
-        cmcs = [self.cards_data.get(c, {}).get('cmc', 0) for c in sorted_cards 
-                if not self.cards_data.get(c, {}).get('is_land', False)]
-        avg_cmc = sum(cmcs) / len(cmcs) if cmcs else 0
-        
-        # Mostrar estadísticas
-        print(Fore.CYAN + "\n┌─ ESTADÍSTICAS " + "─" * 43 + "┐")
-        print(f"│ {Fore.GREEN}✓{Fore.CYAN} Total de cartas: {Fore.WHITE}{total_cards}{Fore.CYAN}")
-        print(f"│ {Fore.GREEN}✓{Fore.CYAN} Cartas únicas: {Fore.WHITE}{unique_cards}{Fore.CYAN}")
-        print(f"│ {Fore.GREEN}✓{Fore.CYAN} CMC promedio (sin tierras): {Fore.WHITE}{avg_cmc:.2f}{Fore.CYAN}")
-        print("└" + "─" * 59 + "┘" + Style.RESET_ALL)
+        # Mostrar estadísticas (todo se acumula y se escribe de una vez)
+        out = [
+            Fore.CYAN + "\n┌─ ESTADÍSTICAS " + "─" * 43 + "┐",
+            f"│ {Fore.GREEN}✓{Fore.CYAN} Total de cartas: {Fore.WHITE}{stats['total_cards']}{Fore.CYAN}",
+            f"│ {Fore.GREEN}✓{Fore.CYAN} Cartas únicas: {Fore.WHITE}{stats['unique_cards']}{Fore.CYAN}",
+            f"│ {Fore.GREEN}✓{Fore.CYAN} CMC promedio (sin tierras): {Fore.WHITE}{stats['avg_cmc']:.2f}{Fore.CYAN}",
+            "└" + "─" * 59 + "┘" + Style.RESET_ALL,
+        ]
         
         # Mostrar cartas
-        print(Fore.YELLOW + "\n╔═ CARTAS ENCONTRADAS " + "═" * 37 + "╗" + Style.RESET_ALL)
+        out.append(Fore.YELLOW + "\n╔═ CARTAS ENCONTRADAS " + "═" * 37 + "╗" + Style.RESET_ALL)
         
-        for card_name in card_counts.keys():
+        for card_name in sorted_cards:
             count = card_counts[card_name]
             card_info = self.cards_data.get(card_name, {})
             
             # Info de la carta
             cmc = card_info.get('cmc', 0)
-            type_line = card_info.get('type_line', '')
             colors = card_info.get('color_identity', [])
             
             # Icono de tipo
-            icon = ''
-            for t in ['Land', 'Creature', 'Planeswalker', 'Artifact', 'Enchantment', 'Instant', 'Sorcery']:
-                if t in type_line:
-                    icon = self._get_type_icon(t)
-                    break
+            icon = _TYPE_ICON_BY_RANK[self._index_by_name[card_name].type_rank]
             
             # Símbolos de color
             color_str = ''.join(colors) if colors else 'C'
             
             # Formato bonito
-            print(f"{Fore.WHITE}║{Style.RESET_ALL} {icon} {Fore.CYAN}{count}x{Style.RESET_ALL} {Fore.WHITE}{card_name:<40}{Style.RESET_ALL} "
-                  f"{Fore.YELLOW}CMC:{cmc}{Style.RESET_ALL} {Fore.MAGENTA}{color_str}{Style.RESET_ALL}")
+            out.append(f"{Fore.WHITE}║{Style.RESET_ALL} {icon} {Fore.CYAN}{count}x{Style.RESET_ALL} {Fore.WHITE}{card_name:<40}{Style.RESET_ALL} "
+                       f"{Fore.YELLOW}CMC:{cmc}{Style.RESET_ALL} {Fore.MAGENTA}{color_str}{Style.RESET_ALL}")
         
-        print(Fore.YELLOW + "╚" + "═" * 59 + "╝" + Style.RESET_ALL)
+        out.append(Fore.YELLOW + "╚" + "═" * 59 + "╝" + Style.RESET_ALL)
+        sys.stdout.write("\n".join(out) + "\n")
     
     def clear_filters(self):
         """Limpia todos los filtros."""
@@ -381,7 +506,7 @@ class CardFilter:
             print(f"{Fore.YELLOW}│{Style.RESET_ALL} [7] ⬅️  Volver al menú anterior")
             print(Fore.YELLOW + "└" + "─" * 59 + "┘" + Style.RESET_ALL)
             
-            choice = input(f"\n{Fore.CYAN}➤{Style.RESET_ALL} Elige una opción: ").strip()
+            choice = read_choice(f"\n{Fore.CYAN}➤{Style.RESET_ALL} Elige una opción: ").strip()
             
             if choice == '1':
                 self.filter_by_colors()
@@ -3,9 +3,28 @@ Módulo para listar y categorizar cartas del mazo.
 Todo dinámico basado en datos de Scryfall API.
 """
 
+import re
+import sys
 from typing import Dict, List
 from collections import Counter
 
+from scryfall_api import TYPE_PRIORITY
+
+
+# Símbolos de maná de color en el texto (ya en minúsculas)
+_MANA_SYMBOL_RE = re.compile(r'\{[wubrg]\}')
+
+# Grupo de list_full_deck para cada tipo principal
+_FULL_DECK_GROUP = {
+    'Land': 'Tierras',
+    'Creature': 'Criaturas',
+    'Instant': 'Instantaneos',
+    'Sorcery': 'Conjuros',
+    'Artifact': 'Artefactos',
+    'Enchantment': 'Encantamientos',
+    'Planeswalker': 'Planeswalkers',
+}
+
 
 class CardLister:
     
@@ -19,10 +38,15 @@ class CardLister:
         """
         self.cards_data = cards_data
         self.deck_list = deck_list
+        
+        # Copias de cada carta en el mazo (se cuenta una sola vez)
+        self._counts = Counter(deck_list)
     
     def _count_cards(self, card_names: List[str]) -> Dict[str, int]:
         """
-        Cuenta cuántas veces aparece cada carta en una lista.
+        Cuenta cuántas veces aparece cada carta de una lista en el mazo.
+        Las listas de cada grupo contienen todas las copias de sus cartas,
+        así que se reutilizan los conteos del mazo en lugar de recontar.
         
         Args:
             card_names: Lista de nombres de cartas
@@ -30,18 +54,14 @@ class CardLister:
         Returns:
             Diccionario {nombre: cantidad}
         """
-        return dict(Counter(card_names))
+        return {name: self._counts[name] for name in set(card_names)}
     
     def _get_card_type(self, type_line: str) -> str:
         """
         Extrae el tipo principal de una carta desde type_line.
         Ejemplo: "Legendary Creature — Ninja" -> "Creature"
         """
-        # Orden de prioridad para cartas con múltiples tipos
-        type_priority = ['Land', 'Creature', 'Planeswalker', 'Artifact', 
-                        'Enchantment', 'Instant', 'Sorcery']
-        
-        for card_type in type_priority:
+        for card_type in TYPE_PRIORITY:
             if card_type in type_line:
                 return card_type
         
@@ -62,12 +82,8 @@ class CardLister:
         if 'search your library for' in oracle_text and 'land' in oracle_text:
             return 'Fetch'
         
-        # Contar colores que produce
-        colors_produced = []
-        mana_symbols = ['{W}', '{U}', '{B}', '{R}', '{G}']
-        for symbol in mana_symbols:
-            if symbol.lower() in oracle_text or symbol in oracle_text:
-                colors_produced.append(symbol)
+        # Contar colores que produce (una sola pasada sobre el texto)
+        colors_produced = set(_MANA_SYMBOL_RE.findall(oracle_text))
         
         # Tri-lands (3+ colores)
         if len(colors_produced) >= 3:
@@ -81,18 +97,34 @@ class CardLister:
         else:
             return 'Utilidad'
     
+    def _format_group(self, title: str, cards: List[str]) -> List[str]:
+        """
+        Formatea un grupo de cartas con su cantidad.
+        
+        Returns:
+            Líneas del grupo (título, "Nx carta" por carta y una línea vacía)
+        """
+        counted = self._count_cards(cards)
+        lines = [f"-- {title.upper()} ({len(cards)}) --"]
+        lines.extend(f"  {count}x {card_name}" for card_name, count in sorted(counted.items()))
+        lines.append("")
+        return lines
+    
+    def _write(self, lines: List[str]):
+        """Escribe todas las líneas de una vez en lugar de un print() por línea."""
+        sys.stdout.write("\n".join(lines) + "\n")
+    
     def list_lands(self):
         """Lista todas las tierras agrupadas por subtipo."""
-        print("\n" + "=" * 60)
-        print("TIERRAS DEL MAZO")
-        print("=" * 60)
+        out = ["\n" + "=" * 60, "TIERRAS DEL MAZO", "=" * 60]
         
-        # Filtrar tierras del mazo
-        lands = [name for name in self.deck_list 
+        # Filtrar tierras del mazo (una entrada por nombre único)
+        lands = [name for name in self._counts 
                 if self.cards_data.get(name, {}).get('is_land', False)]
         
         if not lands:
-            print("\nNo hay tierras en el mazo.")
+            out.append("\nNo hay tierras en el mazo.")
+            self._write(out)
             return
         
         # Agrupar por subtipo
@@ -104,33 +136,30 @@ class CardLister:
             'Utilidad': []
         }
         
+        # Categorizar cada tierra una sola vez y añadir todas sus copias
         for land_name in lands:
             card_info = self.cards_data.get(land_name, {})
             category = self._categorize_land_type(land_name, card_info)
-            land_categories[category].append(land_name)
+            land_categories[category].extend([land_name] * self._counts[land_name])
         
         # Mostrar por categoría
-        total = len(lands)
-        print(f"\nTotal: {total} tierras\n")
+        total = sum(self._counts[name] for name in lands)
+        out.append(f"\nTotal: {total} tierras\n")
         
         for category, cards in land_categories.items():
             if cards:
-                counted = self._count_cards(cards)
-                print(f"-- {category.upper()} ({len(cards)}) --")
-                for card_name, count in sorted(counted.items()):
-                    print(f"  {count}x {card_name}")
-                print()
+                out.extend(self._format_group(category, cards))
         
-        print("=" * 60)
+        out.append("=" * 60)
+        self._write(out)
     
     def list_ramp(self, ramp_cards: List[str]):
         """Lista todas las cartas de ramp agrupadas por tipo."""
-        print("\n" + "=" * 60)
-        print("RAMP DEL MAZO")
-        print("=" * 60)
+        out = ["\n" + "=" * 60, "RAMP DEL MAZO", "=" * 60]
         
         if not ramp_cards:
-            print("\nNo hay ramp detectado en el mazo.")
+            out.append("\nNo hay ramp detectado en el mazo.")
+            self._write(out)
             return
         
         # Agrupar por tipo de carta
@@ -162,30 +191,26 @@ class CardLister:
         
         # Mostrar
         total = len(ramp_cards)
-        print(f"\nTotal: {total} cartas de ramp\n")
+        out.append(f"\nTotal: {total} cartas de ramp\n")
         
         for card_type, cards in ramp_by_type.items():
             if cards:
-                counted = self._count_cards(cards)
-                print(f"-- {card_type.upper()} ({len(cards)}) --")
-                for card_name, count in sorted(counted.items()):
-                    print(f"  {count}x {card_name}")
-                print()
+                out.extend(self._format_group(card_type, cards))
         
-        print("=" * 60)
+        out.append("=" * 60)
+        self._write(out)
     
     def list_creatures(self):
         """Lista todas las criaturas agrupadas por raza/subtipo."""
-        print("\n" + "=" * 60)
-        print("CRIATURAS DEL MAZO")
-        print("=" * 60)
+        out = ["\n" + "=" * 60, "CRIATURAS DEL MAZO", "=" * 60]
         
         # Filtrar criaturas
         creatures = [name for name in self.deck_list 
                     if self.cards_data.get(name, {}).get('is_creature', False)]
         
         if not creatures:
-            print("\nNo hay criaturas en el mazo.")
+            out.append("\nNo hay criaturas en el mazo.")
+            self._write(out)
             return
         
         # Agrupar por subtipo/raza
@@ -209,7 +234,7 @@ class CardLister:
         
         # Mostrar
         total = len(creatures)
-        print(f"\nTotal: {total} criaturas\n")
+        out.append(f"\nTotal: {total} criaturas\n")
         
         # Ordenar por cantidad (más comunes primero)
         sorted_subtypes = sorted(by_subtype.items(), 
@@ -217,68 +242,47 @@ class CardLister:
                                 reverse=True)
         
         for subtype, cards in sorted_subtypes:
-            counted = self._count_cards(cards)
-            print(f"-- {subtype.upper()} ({len(cards)}) --")
-            for card_name, count in sorted(counted.items()):
-                print(f"  {count}x {card_name}")
-            print()
+            out.extend(self._format_group(subtype, cards))
         
-        print("=" * 60)
+        out.append("=" * 60)
+        self._write(out)
     
     def list_interactions(self, removal: List[str], board_wipes: List[str], 
                          card_draw: List[str], counterspells: List[str]):
         """Lista todas las interacciones agrupadas por función."""
-        print("\n" + "=" * 60)
-        print("INTERACCIONES DEL MAZO")
-        print("=" * 60)
+        out = ["\n" + "=" * 60, "INTERACCIONES DEL MAZO", "=" * 60]
         
         total = len(removal) + len(board_wipes) + len(card_draw) + len(counterspells)
         
         if total == 0:
-            print("\nNo hay interacciones detectadas.")
+            out.append("\nNo hay interacciones detectadas.")
+            self._write(out)
             return
         
-        print(f"\nTotal: {total} cartas de interaccion\n")
+        out.append(f"\nTotal: {total} cartas de interaccion\n")
         
         # Board Wipes
         if board_wipes:
-            counted = self._count_cards(board_wipes)
-            print(f"-- BOARD WIPES ({len(board_wipes)}) --")
-            for card_name, count in sorted(counted.items()):
-                print(f"  {count}x {card_name}")
-            print()
+            out.extend(self._format_group("BOARD WIPES", board_wipes))
         
         # Removal Puntual
         if removal:
-            counted = self._count_cards(removal)
-            print(f"-- REMOVAL PUNTUAL ({len(removal)}) --")
-            for card_name, count in sorted(counted.items()):
-                print(f"  {count}x {card_name}")
-            print()
+            out.extend(self._format_group("REMOVAL PUNTUAL", removal))
         
         # Robo de cartas
         if card_draw:
-            counted = self._count_cards(card_draw)
-            print(f"-- ROBO DE CARTAS ({len(card_draw)}) --")
-            for card_name, count in sorted(counted.items()):
-                print(f"  {count}x {card_name}")
-            print()
+            out.extend(self._format_group("ROBO DE CARTAS", card_draw))
         
         # Counterspells
         if counterspells:
-            counted = self._count_cards(counterspells)
-            print(f"-- COUNTERSPELLS ({len(counterspells)}) --")
-            for card_name, count in sorted(counted.items()):
-                print(f"  {count}x {card_name}")
-            print()
+            out.extend(self._format_group("COUNTERSPELLS", counterspells))
         
-        print("=" * 60)
+        out.append("=" * 60)
+        self._write(out)
     
     def list_full_deck(self):
         """Lista el mazo completo agrupado por tipo de carta."""
-        print("\n" + "=" * 60)
-        print("MAZO COMPLETO")
-        print("=" * 60)
+        out = ["\n" + "=" * 60, "MAZO COMPLETO", "=" * 60]
         
         # Agrupar por tipo
         by_type = {
@@ -299,29 +303,15 @@ class CardLister:
                 by_type['Otras'].append(card_name)
                 continue
             
-            type_line = card_info.get('type_line', '')
-            card_type = self._get_card_type(type_line)
+            # Tipo principal precalculado al cargar (o calculado si falta)
+            card_type = (card_info.get('primary_type')
+                         or self._get_card_type(card_info.get('type_line', '')))
             
-            if card_type == 'Land':
-                by_type['Tierras'].append(card_name)
-            elif card_type == 'Creature':
-                by_type['Criaturas'].append(card_name)
-            elif card_type == 'Instant':
-                by_type['Instantaneos'].append(card_name)
-            elif card_type == 'Sorcery':
-                by_type['Conjuros'].append(card_name)
-            elif card_type == 'Artifact':
-                by_type['Artefactos'].append(card_name)
-            elif card_type == 'Enchantment':
-                by_type['Encantamientos'].append(card_name)
-            elif card_type == 'Planeswalker':
-                by_type['Planeswalkers'].append(card_name)
-            else:
-                by_type['Otras'].append(card_name)
+            by_type[_FULL_DECK_GROUP.get(card_type, 'Otras')].append(card_name)
         
         # Mostrar
         total = len(self.deck_list)
-        print(f"\nTotal: {total} cartas\n")
+        out.append(f"\nTotal: {total} cartas\n")
         
         # Orden específico
         type_order = ['Tierras', 'Criaturas', 'Planeswalkers', 'Instantaneos', 
@@ -330,10 +320,7 @@ class CardLister:
         for card_type in type_order:
             cards = by_type[card_type]
             if cards:
-                counted = self._count_cards(cards)
-                print(f"-- {card_type.upper()} ({len(cards)}) --")
-                for card_name, count in sorted(counted.items()):
-                    print(f"  {count}x {card_name}")
-                print()
+                out.extend(self._format_group(card_type, cards))
         
-        print("=" * 60)
+        out.append("=" * 60)
+        self._write(out)
@@ -0,0 +1,24 @@
+"""
+Módulo para normalizar nombres de cartas.
+Lo usan el parser de mazos (sin red) y el cliente de Scryfall, para que los
+dos comparen los nombres escritos de la misma forma.
+"""
+
+import re
+import unicodedata
+
+
+# Comillas tipográficas -> rectas (los nombres de Scryfall usan las rectas)
+_QUOTE_TABLE = str.maketrans({'\u2018': "'", '\u2019': "'", '\u02bc': "'",
+                              '\u201c': '"', '\u201d': '"'})
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_card_name(card_name: str) -> str:
+    """
+    Normaliza un nombre de carta: Unicode NFKC, comillas rectas y un solo
+    espacio entre palabras.
+    Ejemplo: "Sensei’s  Divining Top " -> "Sensei's Divining Top"
+    """
+    card_name = unicodedata.normalize('NFKC', card_name).translate(_QUOTE_TABLE)
+    return _WHITESPACE_RE.sub(' ', card_name).strip()
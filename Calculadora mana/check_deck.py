@@ -2,9 +2,9 @@
 Script simple para ver qué hay en elemental.txt
 """
 
-# Leer archivo línea por línea
+# Leer archivo completo de una vez y separar en líneas
 with open("elemental.txt", "r", encoding="utf-8") as f:
-    lines = f.readlines()
+    lines = f.read().splitlines()
 
 print(f"Total de líneas en el archivo: {len(lines)}")
 print(f"\nPrimeras 5 líneas:")
@@ -15,18 +15,12 @@ print(f"\nÚltimas 5 líneas:")
 for i, line in enumerate(lines[-5:], len(lines)-4):
     print(f"{i}. {line.strip()}")
 
-# Contar cartas
+# Contar cartas (solo líneas que empiezan con una cantidad)
 total_cards = 0
 for line in lines:
-    line = line.strip()
-    if line and not line.startswith('#'):
-        parts = line.split(maxsplit=1)
-        if parts:
-            try:
-                quantity = int(parts[0])
-                total_cards += quantity
-            except:
-                pass
+    parts = line.split(maxsplit=1)
+    if parts and parts[0].isdecimal():
+        total_cards += int(parts[0])
 
 print(f"\n📦 Total de cartas contadas: {total_cards}")
 print(f"⚠️  Nota: Un mazo de Commander debe tener 100 cartas (99 + comandante)")
@@ -0,0 +1,44 @@
+"""
+Módulo de lectura de opciones del usuario.
+Cuando la entrada viene de un pipe o archivo (ej: cat comandos.txt | python main.py)
+lee las líneas con buffer en lugar de llamar a input() en cada vuelta del menú.
+"""
+
+import sys
+
+
+# Iterador de líneas de stdin cuando no es una terminal (None = aún sin decidir)
+_piped_lines = None
+_interactive = None
+
+
+def read_choice(prompt=""):
+    """
+    Lee una línea de la entrada estándar, igual que input().
+    
+    Args:
+        prompt: Texto a mostrar antes de leer
+    
+    Returns:
+        Línea leída, sin el salto de línea final
+    
+    Raises:
+        EOFError: Si la entrada se terminó
+    """
+    global _piped_lines, _interactive
+    
+    if _interactive is None:
+        _interactive = sys.stdin.isatty()
+        if not _interactive:
+            _piped_lines = iter(sys.stdin)
+    
+    if _interactive:
+        return input(prompt)
+    
+    sys.stdout.write(prompt)
+    try:
+        line = next(_piped_lines)
+    except StopIteration:
+        raise EOFError from None
+    
+    return line[:-1] if line.endswith('\n') else line
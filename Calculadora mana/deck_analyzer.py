@@ -3,10 +3,183 @@ Módulo para analizar mazos de MTG Commander.
 Categoriza cartas y calcula estadísticas.
 """
 
-from typing import Dict, List
+import re
+from typing import Dict, List, Set
 from collections import Counter
 
 
+# Palabras clave de cada categoría (se buscan en el texto oracle en minúsculas)
+REMOVAL_KEYWORDS = (
+    'destroy target',
+    'exile target',
+    'return target',
+    'put target',
+    'sacrifice target',
+    'tap target',
+    '-x/-x',
+    'damage to target',
+    'damage to any target',
+    'deals damage',
+    'fight',
+    'return up to one target',
+    'return another target',
+)
+
+BOARD_WIPE_KEYWORDS = (
+    'destroy all',
+    'exile all',
+    'return all',
+    'each creature',
+    'all creatures',
+    'each permanent',
+    'all permanents',
+    'each opponent sacrifices',
+    'wrath',
+)
+
+COUNTER_KEYWORDS = (
+    'counter target',
+    'counter that',
+    'counter up to',
+    'exile it instead of putting it into a graveyard',  # Misdirection type
+)
+
+DRAW_KEYWORDS = (
+    'draw a card',
+    'draw cards',
+    'draw two',
+    'draw three',
+    'draw that many',
+    'draws a card',
+    'scry',
+    'surveil',
+    'look at the top',
+    'reveal cards',
+    'whenever you draw',
+    'you may draw',
+    'draw equal',
+)
+
+# Bit de cada color de la identidad de color (0 = incoloro)
+COLOR_BITS = {color: 1 << i for i, color in enumerate('WUBRG')}
+
+# Categorías del análisis y el bit de cada una en la máscara de categorías de una carta
+CATEGORIES = ('lands', 'ramp', 'creatures', 'elementals', 'removal',
+              'board_wipes', 'card_draw', 'counterspells', 'other')
+CATEGORY_BITS = {category: 1 << i for i, category in enumerate(CATEGORIES)}
+
+# Nombres comunes de board wipes
+WIPE_NAMES = (
+    'evacuation',
+    'cyclone summoner',
+    'in garruk\'s wake',
+    'necromantic selection',
+    'blustersquall',
+    'succumb to the cold',
+    'dead drop',
+)
+
+# Nombres específicos de cartas de ventaja
+ADVANTAGE_CARD_NAMES = (
+    'sensei\'s divining top',
+    'mystic remora',
+    'the temporal anchor',
+    'prying eyes',
+    'halimar depths',
+)
+
+# Categoría de cada palabra clave
+_KEYWORD_CATEGORY = {
+    keyword: category
+    for category, keywords in (('removal', REMOVAL_KEYWORDS),
+                               ('board_wipes', BOARD_WIPE_KEYWORDS),
+                               ('counterspells', COUNTER_KEYWORDS),
+                               ('card_draw', DRAW_KEYWORDS))
+    for keyword in keywords
+}
+
+# Todas las palabras clave en una sola expresión: el lookahead permite
+# encontrar coincidencias solapadas en una pasada (ninguna palabra clave
+# es prefijo de otra, así que no se pierde ninguna)
+_KEYWORD_RE = re.compile('(?=(' + '|'.join(map(re.escape, _KEYWORD_CATEGORY)) + '))')
+
+# Criaturas que sí cuentan como removal (ETB o habilidad activada)
+_CREATURE_REMOVAL_RE = re.compile(r'when|enters|\{t\}:')
+
+# Nombres conocidos como conjuntos: se comparan nombres completos, no subcadenas
+_WIPE_NAME_SET = frozenset(WIPE_NAMES)
+_ADVANTAGE_NAME_SET = frozenset(ADVANTAGE_CARD_NAMES)
+
+
+def _name_keys(card_name: str) -> Set[str]:
+    """
+    Nombre en minúsculas y, para cartas de dos caras ("A // B"), el de cada cara.
+    """
+    name_lower = card_name.lower()
+    return {name_lower, *(face.strip() for face in name_lower.split('//'))}
+
+
+class CardTable:
+    """
+    Datos de las cartas únicas de un mazo organizados en columnas:
+    la posición i de cada lista corresponde a la carta names[i].
+    """
+    
+    def __init__(self):
+        self.names = []
+        self.index = {}  # {nombre: fila}
+        self.cmc = []
+        self.is_land = []
+        self.is_ramp = []
+        self.is_creature = []
+        self.is_elemental = []
+        self.color_mask = []
+        self.type_line = []
+        self.oracle_lower = []  # Texto oracle ya en minúsculas
+    
+    def __len__(self):
+        return len(self.names)
+    
+    @classmethod
+    def from_cards_data(cls, cards_data: Dict[str, Dict], card_names: List[str]) -> 'CardTable':
+        """
+        Construye la tabla con las cartas de una lista que tienen datos de Scryfall.
+        
+        Args:
+            cards_data: Diccionario {nombre_carta: info_scryfall}
+            card_names: Nombres de cartas (puede tener duplicados)
+        
+        Returns:
+            CardTable con una fila por carta única (sin las cartas con error)
+        """
+        table = cls()
+        
+        for card_name in card_names:
+            if card_name in table.index:
+                continue
+            
+            card_info = cards_data.get(card_name, {})
+            if not card_info or 'error' in card_info:
+                continue
+            
+            color_mask = 0
+            for color in card_info.get('color_identity', []):
+                color_mask |= COLOR_BITS.get(color, 0)
+            
+            table.index[card_name] = len(table.names)
+            table.names.append(card_name)
+            table.cmc.append(int(card_info.get('cmc', 0)))
+            table.is_land.append(card_info.get('is_land', False))
+            table.is_ramp.append(card_info.get('is_ramp', False))
+            table.is_creature.append(card_info.get('is_creature', False))
+            table.is_elemental.append('Elemental' in card_info.get('subtypes', []))
+            table.color_mask.append(color_mask)
+            table.type_line.append(card_info.get('type_line', ''))
+            table.oracle_lower.append(card_info.get('oracle_text', '').lower())
+        
+        return table
+
+
 class DeckAnalyzer:
     
     def __init__(self, cards_data: Dict[str, Dict], deck_list: List[str] = None):
@@ -19,193 +192,178 @@ class DeckAnalyzer:
         """
         self.cards_data = cards_data
         self.deck_list = deck_list or []
-        self.categories = self._categorize_cards()
+        
+        # Lista de cartas a analizar; si no hay deck_list, usar cards_data directamente
+        self._canonical = self.deck_list if self.deck_list else list(self.cards_data.keys())
+        
+        # Datos en columnas por carta única; el mazo es la lista de filas de sus cartas
+        # (-1 = carta sin datos de Scryfall)
+        self._table = CardTable.from_cards_data(self.cards_data, self._canonical)
+        self._deck_idx = [self._table.index.get(card_name, -1) for card_name in self._canonical]
+        # Copias de cada fila en el mazo, contadas de una vez (en orden de aparición)
+        self._row_counts = Counter(self._deck_idx)
+        
+        self._category_counts = self._categorize_cards()
+        self._categories = None
+        self._stats_cache = None
     
-    def _categorize_cards(self) -> Dict[str, List[str]]:
+    @property
+    def categories(self) -> Dict[str, List[str]]:
+        """
+        Listas de cartas por categoría (con duplicados, en el orden del mazo).
+        Se construyen solo la primera vez que se piden.
+        """
+        if self._categories is None:
+            categories = {category: [] for category in CATEGORIES}
+            for card_name, idx in zip(self._canonical, self._deck_idx):
+                category_mask = self._row_categories[idx] if idx >= 0 else CATEGORY_BITS['other']
+                for category, bit in CATEGORY_BITS.items():
+                    if category_mask & bit:
+                        categories[category].append(card_name)
+            
+            self._categories = categories
+        
+        return self._categories
+    
+    def _categorize_cards(self) -> Dict[str, int]:
         """
         Categoriza las cartas en diferentes grupos.
         Cuenta cada carta según las veces que aparece en el deck_list.
         
         Returns:
-            Diccionario con categorías y listas de nombres de cartas (con duplicados)
+            Diccionario {categoría: cantidad de cartas (con duplicados)}
         """
-        categories = {
-            'lands': [],
-            'ramp': [],
-            'creatures': [],
-            'elementals': [],
-            'removal': [],
-            'board_wipes': [],
-            'card_draw': [],
-            'counterspells': [],
-            'other': []
+        # Cada carta única se categoriza una sola vez; las copias repiten su máscara
+        self._row_categories = [self._categorize_card(idx) for idx in range(len(self._table))]
+        
+        # Si la carta no está en Scryfall data, cuenta como "other"
+        mask_counts = self._count_by_row(self._row_categories, missing=CATEGORY_BITS['other'])
+        
+        return {
+            category: sum(count for mask, count in mask_counts.items() if mask & bit)
+            for category, bit in CATEGORY_BITS.items()
         }
+    
+    def _count_by_row(self, row_values: List, missing=None) -> Counter:
+        """
+        Cuenta las cartas del mazo agrupadas por un valor de su fila,
+        sumando las copias de cada carta única de una vez.
         
-        # Si no hay deck_list, usar cards_data directamente
-        if not self.deck_list:
-            cards_to_process = list(self.cards_data.keys())
-        else:
-            cards_to_process = self.deck_list
+        Args:
+            row_values: Valor de cada fila de la tabla (ej: máscara de colores)
+            missing: Valor para las cartas sin datos de Scryfall (None = no contarlas)
         
-        for card_name in cards_to_process:
-            card_info = self.cards_data.get(card_name, {})
-            # Si la carta no está en Scryfall data, agregar a "other"
-            if not card_info or 'error' in card_info:
-                categories['other'].append(card_name)
-                continue
-            
-            # Tierras
-            if card_info.get('is_land', False):
-                categories['lands'].append(card_name)
-            
-            # Ramp (no tierras)
-            elif card_info.get('is_ramp', False):
-                categories['ramp'].append(card_name)
-            
-            # Criaturas
-            if card_info.get('is_creature', False):
-                categories['creatures'].append(card_name)
-                
-                # Elementales
-                subtypes = card_info.get('subtypes', [])
-                if 'Elemental' in subtypes:
-                    categories['elementals'].append(card_name)
-            
-            # Removal
-            oracle_text = card_info.get('oracle_text', '').lower()
-            type_line = card_info.get('type_line', '')
-            
-            # Board wipes (detectar primero antes que removal puntual)
-            if self._is_board_wipe(oracle_text, card_name):
-                categories['board_wipes'].append(card_name)
-            # Removal puntual
-            elif self._is_removal(oracle_text, type_line):
-                categories['removal'].append(card_name)
-            
-            # Card draw
-            if self._is_card_draw(oracle_text, card_name):
-                categories['card_draw'].append(card_name)
-            
-            # Counterspells
-            if self._is_counterspell(oracle_text):
-                categories['counterspells'].append(card_name)
+        Returns:
+            Counter {valor: cantidad de cartas}
+        """
+        counts = Counter()
+        
+        for idx, copies in self._row_counts.items():
+            if idx >= 0:
+                counts[row_values[idx]] += copies
+            elif missing is not None:
+                counts[missing] += copies
+        
+        return counts
+    
+    def _categorize_card(self, idx: int) -> int:
+        """
+        Determina las categorías de una carta.
+        
+        Args:
+            idx: Fila de la carta en la tabla
+        
+        Returns:
+            Máscara con el bit (CATEGORY_BITS) de cada categoría de la carta
+        """
+        table = self._table
+        card_name = table.names[idx]
+        category_mask = 0
+        is_land = table.is_land[idx]
+        is_ramp = table.is_ramp[idx]
+        is_creature = table.is_creature[idx]
+        
+        # Tierras
+        if is_land:
+            category_mask |= CATEGORY_BITS['lands']
+        
+        # Ramp (no tierras)
+        elif is_ramp:
+            category_mask |= CATEGORY_BITS['ramp']
+        
+        # Criaturas
+        if is_creature:
+            category_mask |= CATEGORY_BITS['creatures']
             
-            # Si no encaja en ninguna categoría específica (y no es tierra ni criatura)
-            if not any([
-                card_info.get('is_land', False),
-                card_info.get('is_ramp', False),
-                card_name in categories['removal'],
-                card_name in categories['board_wipes'],
-                card_name in categories['card_draw'],
-                card_name in categories['counterspells']
-            ]):
-                if not card_info.get('is_creature', False):
-                    categories['other'].append(card_name)
-        
-        return categories
+            # Elementales
+            if table.is_elemental[idx]:
+                category_mask |= CATEGORY_BITS['elementals']
+        
+        # Removal
+        oracle_text = table.oracle_lower[idx]
+        type_line = table.type_line[idx]
+        tags = self._keyword_tags(oracle_text)
+        
+        # Board wipes (detectar primero antes que removal puntual)
+        in_wipe = self._is_board_wipe(tags, card_name)
+        # Removal puntual
+        in_removal = not in_wipe and self._is_removal(tags, oracle_text, type_line)
+        in_draw = self._is_card_draw(tags, card_name)
+        in_counter = self._is_counterspell(tags)
+        
+        if in_wipe:
+            category_mask |= CATEGORY_BITS['board_wipes']
+        elif in_removal:
+            category_mask |= CATEGORY_BITS['removal']
+        
+        # Card draw
+        if in_draw:
+            category_mask |= CATEGORY_BITS['card_draw']
+        
+        # Counterspells
+        if in_counter:
+            category_mask |= CATEGORY_BITS['counterspells']
+        
+        # Si no encaja en ninguna categoría específica (y no es tierra ni criatura)
+        if not (is_land or is_ramp or in_removal or in_wipe or in_draw or in_counter
+                or is_creature):
+            category_mask |= CATEGORY_BITS['other']
+        
+        return category_mask
     
-    def _is_removal(self, oracle_text: str, type_line: str) -> bool:
-        """Detecta si una carta es removal puntual."""
-        removal_keywords = [
-            'destroy target',
-            'exile target',
-            'return target',
-            'put target',
-            'sacrifice target',
-            'tap target',
-            '-x/-x',
-            'damage to target',
-            'damage to any target',
-            'deals damage',
-            'fight',
-            'return up to one target',
-            'return another target',
-        ]
+    def _keyword_tags(self, oracle_text: str) -> Set[str]:
+        """
+        Busca todas las palabras clave en el texto oracle de una sola pasada.
         
+        Args:
+            oracle_text: Texto oracle en minúsculas
+        
+        Returns:
+            Conjunto de categorías con al menos una palabra clave en el texto
+        """
+        return {_KEYWORD_CATEGORY[keyword] for keyword in _KEYWORD_RE.findall(oracle_text)}
+    
+    def _is_removal(self, tags: Set[str], oracle_text: str, type_line: str) -> bool:
+        """Detecta si una carta es removal puntual."""
         # Excluir criaturas (salvo algunas con habilidades de removal claras)
         if 'Creature' in type_line:
             # Permitir criaturas con removal en ETB o habilidades activadas
-            if 'when' in oracle_text or 'enters' in oracle_text or '{t}:' in oracle_text:
-                pass
-            else:
+            if not _CREATURE_REMOVAL_RE.search(oracle_text):
                 return False
         
-        return any(keyword in oracle_text for keyword in removal_keywords)
+        return 'removal' in tags
     
-    def _is_board_wipe(self, oracle_text: str, card_name: str) -> bool:
+    def _is_board_wipe(self, tags: Set[str], card_name: str) -> bool:
         """Detecta si una carta es un board wipe (limpieza masiva)."""
-        board_wipe_keywords = [
-            'destroy all',
-            'exile all',
-            'return all',
-            'each creature',
-            'all creatures',
-            'each permanent',
-            'all permanents',
-            'each opponent sacrifices',
-            'wrath',
-        ]
-        
-        # Nombres comunes de board wipes
-        wipe_names = [
-            'evacuation',
-            'cyclone summoner',
-            'in garruk\'s wake',
-            'necromantic selection',
-            'blustersquall',
-            'succumb to the cold',
-            'dead drop',
-        ]
-        
-        card_name_lower = card_name.lower()
-        if any(name in card_name_lower for name in wipe_names):
-            return True
-        
-        return any(keyword in oracle_text for keyword in board_wipe_keywords)
+        return 'board_wipes' in tags or not _WIPE_NAME_SET.isdisjoint(_name_keys(card_name))
     
-    def _is_counterspell(self, oracle_text: str) -> bool:
+    def _is_counterspell(self, tags: Set[str]) -> bool:
         """Detecta contrahechizos."""
-        counter_keywords = [
-            'counter target',
-            'counter that',
-            'counter up to',
-            'exile it instead of putting it into a graveyard',  # Misdirection type
-        ]
-        
-        return any(keyword in oracle_text for keyword in counter_keywords)
+        return 'counterspells' in tags
     
-    def _is_card_draw(self, oracle_text: str, card_name: str = '') -> bool:
+    def _is_card_draw(self, tags: Set[str], card_name: str = '') -> bool:
         """Detecta si una carta genera ventaja de cartas (robo, scry, etc)."""
-        draw_keywords = [
-            'draw a card',
-            'draw cards',
-            'draw two',
-            'draw three',
-            'draw that many',
-            'draws a card',
-            'scry',
-            'surveil',
-            'look at the top',
-            'reveal cards',
-            'whenever you draw',
-            'you may draw',
-            'draw equal',
-        ]
-        
-        # Nombres específicos de cartas de ventaja
-        advantage_cards = [
-            'sensei\'s divining top',
-            'mystic remora',
-            'the temporal anchor',
-            'prying eyes',
-            'halimar depths',
-        ]
-        
-        card_name_lower = card_name.lower()
-        if any(name in card_name_lower for name in advantage_cards):
-            return True
-        
-        return any(keyword in oracle_text for keyword in draw_keywords)
+        return 'card_draw' in tags or not _ADVANTAGE_NAME_SET.isdisjoint(_name_keys(card_name))
     
     def get_mana_curve(self) -> Dict[int, int]:
         """
@@ -215,23 +373,15 @@ class DeckAnalyzer:
         Returns:
             Diccionario {cmc: cantidad_de_cartas}
         """
-        cmc_counts = Counter()
+        # Excluir tierras de la curva de maná
+        cmc, is_land = self._table.cmc, self._table.is_land
+        cmc_counts = {}
         
-        # Usar deck_list para contar correctamente
-        cards_to_count = self.deck_list if self.deck_list else list(self.cards_data.keys())
+        for idx, count in self._row_counts.items():
+            if idx >= 0 and not is_land[idx]:
+                cmc_counts[cmc[idx]] = cmc_counts.get(cmc[idx], 0) + count
         
-        for card_name in cards_to_count:
-            card_info = self.cards_data.get(card_name, {})
-            
-            if 'error' in card_info or not card_info:
-                continue
-            
-            # Excluir tierras de la curva de maná
-            if not card_info.get('is_land', False):
-                cmc = int(card_info.get('cmc', 0))
-                cmc_counts[cmc] += 1
-        
-        return dict(cmc_counts)
+        return cmc_counts
     
     def get_color_distribution(self) -> Dict[str, int]:
         """
@@ -241,35 +391,36 @@ class DeckAnalyzer:
         Returns:
             Diccionario {color: cantidad}
         """
-        color_counts = Counter()
+        # Contar cada combinación de colores una vez y repartir por bit
+        mask_counts = self._count_by_row(self._table.color_mask)
+        color_counts = {}
         
-        # Usar deck_list para contar correctamente
-        cards_to_count = self.deck_list if self.deck_list else list(self.cards_data.keys())
+        for color, bit in COLOR_BITS.items():
+            count = sum(n for mask, n in mask_counts.items() if mask & bit)
+            if count:
+                color_counts[color] = count
         
-        for card_name in cards_to_count:
-            card_info = self.cards_data.get(card_name, {})
-            
-            if 'error' in card_info or not card_info:
-                continue
-            
-            colors = card_info.get('color_identity', [])
-            
-            if not colors:
-                color_counts['Colorless'] += 1
-            else:
-                for color in colors:
-                    color_counts[color] += 1
+        if mask_counts[0]:
+            color_counts['Colorless'] = mask_counts[0]
         
-        return dict(color_counts)
+        return color_counts
     
     def get_statistics(self) -> Dict:
         """
         Genera estadísticas completas del mazo.
+        El mazo no cambia después de crear el analizador, así que se calculan
+        una sola vez y las siguientes llamadas reutilizan el resultado.
         
         Returns:
             Diccionario con estadísticas
         """
-        total_cards = len(self.deck_list) if self.deck_list else len(self.cards_data)
+        if self._stats_cache is None:
+            self._stats_cache = self._compute_statistics()
+        return self._stats_cache
+    
+    def _compute_statistics(self) -> Dict:
+        """Calcula las estadísticas que retorna get_statistics."""
+        total_cards = len(self._canonical)
         mana_curve = self.get_mana_curve()
         
         # Calcular CMC promedio (sin tierras)
@@ -279,15 +430,15 @@ class DeckAnalyzer:
         
         stats = {
             'total_cards': total_cards,
-            'lands': len(self.categories['lands']),
-            'ramp': len(self.categories['ramp']),
-            'creatures': len(self.categories['creatures']),
-            'elementals': len(self.categories['elementals']),
-            'removal': len(self.categories['removal']),
-            'board_wipes': len(self.categories['board_wipes']),
-            'card_draw': len(self.categories['card_draw']),
-            'counterspells': len(self.categories['counterspells']),
-            'other': len(self.categories['other']),
+            'lands': self._category_counts['lands'],
+            'ramp': self._category_counts['ramp'],
+            'creatures': self._category_counts['creatures'],
+            'elementals': self._category_counts['elementals'],
+            'removal': self._category_counts['removal'],
+            'board_wipes': self._category_counts['board_wipes'],
+            'card_draw': self._category_counts['card_draw'],
+            'counterspells': self._category_counts['counterspells'],
+            'other': self._category_counts['other'],
             'avg_cmc': avg_cmc,
             'mana_curve': mana_curve,
             'color_distribution': self.get_color_distribution(),
@@ -299,36 +450,35 @@ class DeckAnalyzer:
         """Imprime las estadísticas del mazo de forma legible."""
         stats = self.get_statistics()
         
-        print("\n" + "=" * 60)
-        print("📊 ANÁLISIS DEL MAZO")
-        print("=" * 60)
-        
-        print(f"\n📦 Total de cartas: {stats['total_cards']}")
-        print(f"🏔️  Tierras: {stats['lands']}")
-        print(f"💎 Ramp: {stats['ramp']}")
-        print(f"🐉 Criaturas: {stats['creatures']}")
-        print(f"   └─ 🔥 Elementales: {stats['elementals']}")
-        print(f"⚔️  Removal puntual: {stats['removal']}")
-        print(f"💥 Board Wipes: {stats['board_wipes']}")
-        print(f"📖 Robo de cartas: {stats['card_draw']}")
-        print(f"🚫 Contrahechizos: {stats['counterspells']}")
-        print(f"❓ Otras: {stats['other']}")
-        
-        print(f"\n📈 CMC Promedio (sin tierras): {stats['avg_cmc']:.2f}")
+        out = [
+            "\n" + "=" * 60,
+            "📊 ANÁLISIS DEL MAZO",
+            "=" * 60,
+            f"\n📦 Total de cartas: {stats['total_cards']}",
+            f"🏔️  Tierras: {stats['lands']}",
+            f"💎 Ramp: {stats['ramp']}",
+            f"🐉 Criaturas: {stats['creatures']}",
+            f"   └─ 🔥 Elementales: {stats['elementals']}",
+            f"⚔️  Removal puntual: {stats['removal']}",
+            f"💥 Board Wipes: {stats['board_wipes']}",
+            f"📖 Robo de cartas: {stats['card_draw']}",
+            f"🚫 Contrahechizos: {stats['counterspells']}",
+            f"❓ Otras: {stats['other']}",
+            f"\n📈 CMC Promedio (sin tierras): {stats['avg_cmc']:.2f}",
+        ]
         
         # Curva de maná visual
-        print("\n📊 CURVA DE MANÁ:")
+        out.append("\n📊 CURVA DE MANÁ:")
         mana_curve = stats['mana_curve']
         max_count = max(mana_curve.values()) if mana_curve else 1
         
-        for cmc in sorted(mana_curve.keys()):
-            count = mana_curve[cmc]
-            bar_length = int((count / max_count) * 30)
-            bar = '█' * bar_length
-            print(f"   CMC {cmc:2d}: {bar} ({count})")
+        out.extend(
+            f"   CMC {cmc:2d}: {'█' * int((count / max_count) * 30)} ({count})"
+            for cmc, count in sorted(mana_curve.items())
+        )
         
         # Distribución de colores
-        print("\n🎨 DISTRIBUCIÓN DE COLORES:")
+        out.append("\n🎨 DISTRIBUCIÓN DE COLORES:")
         colors = stats['color_distribution']
         color_symbols = {
             'W': '☀️ Blanco',
@@ -339,11 +489,15 @@ class DeckAnalyzer:
             'Colorless': '◇ Incoloro'
         }
         
-        for color, count in sorted(colors.items(), key=lambda x: x[1], reverse=True):
-            symbol = color_symbols.get(color, color)
-            print(f"   {symbol}: {count}")
+        out.extend(
+            f"   {color_symbols.get(color, color)}: {count}"
+            for color, count in sorted(colors.items(), key=lambda x: x[1], reverse=True)
+        )
+        
+        out.append("=" * 60)
         
-        print("=" * 60)
+        # Una sola escritura en lugar de un print() por línea
+        print("\n".join(out))
     
     def get_category(self, category_name: str) -> List[str]:
         """
@@ -3,7 +3,81 @@ Módulo de cálculos de distribución hipergeométrica para MTG.
 Calcula probabilidades de robar cartas específicas de un mazo.
 """
 
-from math import comb
+from functools import lru_cache
+from math import exp, log
+
+
+# Tabla de log(n!) que crece a demanda; evita recalcular combinaciones con enteros grandes
+_LOG_FACTORIAL = [0.0]
+
+
+def _log_factorial(n):
+    """Retorna log(n!) usando (y extendiendo si hace falta) la tabla precalculada."""
+    if n >= len(_LOG_FACTORIAL):
+        for i in range(len(_LOG_FACTORIAL), n + 1):
+            _LOG_FACTORIAL.append(_LOG_FACTORIAL[-1] + log(i))
+    return _LOG_FACTORIAL[n]
+
+
+def _log_comb(n, k):
+    """Retorna log(C(n, k)) para 0 <= k <= n."""
+    return _log_factorial(n) - _log_factorial(k) - _log_factorial(n - k)
+
+
+@lru_cache(maxsize=256)
+def _full_pmf(N, K, n):
+    """
+    Calcula (y guarda en caché) la probabilidad de cada k en 0..min(K, n).
+    Los menús repiten las mismas consultas (N, K, n), así que cada
+    distribución se calcula una sola vez.
+    
+    Returns:
+        Tupla con la probabilidad de robar exactamente k cartas en la posición k
+    """
+    k_max = min(K, n)
+    # Los k menores a k_min son imposibles: no quedan suficientes cartas de otro tipo
+    k_min = max(0, n - (N - K))
+    
+    if k_min > k_max:
+        return (0.0,) * (k_max + 1) if k_max >= 0 else ()
+    
+    pmf = [0.0] * k_min
+    
+    # Primer término con la tabla de logaritmos; los siguientes por recurrencia:
+    # P(k+1) = P(k) * (K-k)(n-k) / ((k+1)(N-K-n+k+1))
+    prob = exp(_log_comb(K, k_min) + _log_comb(N - K, n - k_min) - _log_comb(N, n))
+    pmf.append(prob)
+    
+    for k in range(k_min, k_max):
+        prob *= (K - k) * (n - k) / ((k + 1) * (N - K - n + k + 1))
+        pmf.append(prob)
+    
+    return tuple(pmf)
+
+
+@lru_cache(maxsize=256)
+def _survival(N, K, n):
+    """
+    Calcula (y guarda en caché) P(X >= k) para cada k en 0..min(K, n),
+    acumulando la distribución desde el final.
+    
+    Returns:
+        Tupla con la probabilidad de robar al menos k cartas en la posición k
+    """
+    survival = []
+    total_prob = 0.0
+    
+    for prob in reversed(_full_pmf(N, K, n)):
+        total_prob += prob
+        survival.append(total_prob)
+    
+    return tuple(reversed(survival))
+
+
+def _check_k(k):
+    """Valida que un número de cartas a robar no sea negativo."""
+    if k < 0:
+        raise ValueError("k no puede ser negativo")
 
 
 def hypergeometric_probability(N, K, n, k):
@@ -21,11 +95,9 @@ def hypergeometric_probability(N, K, n, k):
     """
     if k > K or k > n or (n - k) > (N - K):
         return 0.0
+    _check_k(k)
     
-    numerator = comb(K, k) * comb(N - K, n - k)
-    denominator = comb(N, n)
-    
-    return numerator / denominator
+    return _full_pmf(N, K, n)[k]
 
 
 def probability_at_least(N, K, n, k_min):
@@ -41,13 +113,10 @@ def probability_at_least(N, K, n, k_min):
     Returns:
         Probabilidad (0.0 a 1.0)
     """
-    max_possible = min(K, n)
-    total_prob = 0.0
+    _check_k(k_min)
+    survival = _survival(N, K, n)
     
-    for k in range(k_min, max_possible + 1):
-        total_prob += hypergeometric_probability(N, K, n, k)
-    
-    return total_prob
+    return survival[k_min] if k_min < len(survival) else 0.0
 
 
 def probability_at_most(N, K, n, k_max):
@@ -63,12 +132,10 @@ def probability_at_most(N, K, n, k_max):
     Returns:
         Probabilidad (0.0 a 1.0)
     """
-    total_prob = 0.0
-    
-    for k in range(0, k_max + 1):
-        total_prob += hypergeometric_probability(N, K, n, k)
+    if k_max < 0:
+        return 0.0
     
-    return total_prob
+    return sum(_full_pmf(N, K, n)[:k_max + 1], 0.0)
 
 
 def probability_between(N, K, n, k_min, k_max):
@@ -85,12 +152,11 @@ def probability_between(N, K, n, k_min, k_max):
     Returns:
         Probabilidad (0.0 a 1.0)
     """
-    total_prob = 0.0
-    
-    for k in range(k_min, k_max + 1):
-        total_prob += hypergeometric_probability(N, K, n, k)
+    if k_max < k_min:
+        return 0.0
+    _check_k(k_min)
     
-    return total_prob
+    return sum(_full_pmf(N, K, n)[k_min:k_max + 1], 0.0)
 
 
 def calculate_full_distribution(N, K, n):
@@ -105,14 +171,7 @@ def calculate_full_distribution(N, K, n):
     Returns:
         Lista de tuplas (k, probabilidad) para cada valor posible de k
     """
-    max_possible = min(K, n)
-    distribution = []
-    
-    for k in range(0, max_possible + 1):
-        prob = hypergeometric_probability(N, K, n, k)
-        distribution.append((k, prob))
-    
-    return distribution
+    return list(enumerate(_full_pmf(N, K, n)))
 
 
 def format_percentage(probability):
@@ -11,12 +11,13 @@ import sys
 from colorama import init, Fore, Style
 from tabulate import tabulate
 
-from moxfield_parser import MoxfieldParser
+from moxfield_parser import Card, MoxfieldParser
 from scryfall_api import ScryfallAPI
 from deck_analyzer import DeckAnalyzer
 from mana_base_analyzer import ManaBaseAnalyzer
 from card_lister import CardLister
 from card_filter import CardFilter
+from console_input import read_choice
 from hypergeometric import (
     probability_at_least,
     probability_at_most,
@@ -32,11 +33,25 @@ init()
 
 class MTGCalculator:
     
-    def __init__(self):
+    def __init__(self, use_bulk: bool = False):
         self.deck_cards = []
         self.cards_data = {}
         self.analyzer = None
         self.deck_size = 99  # Commander (100 - 1 comandante)
+        self.use_bulk = use_bulk  # Resolver cartas con el archivo bulk de Scryfall
+        self.api = None  # Se crea al cargar el primer mazo, ver get_api()
+    
+    def get_api(self) -> ScryfallAPI:
+        """
+        Retorna el cliente de Scryfall de la sesión (lo crea la primera vez y,
+        con use_bulk, carga el archivo bulk una sola vez).
+        """
+        if self.api is None:
+            self.api = ScryfallAPI()
+            if self.use_bulk:
+                print(Fore.CYAN + "📦 Cargando datos bulk de Scryfall..." + Style.RESET_ALL)
+                self.api.load_bulk()
+        return self.api
     
     def print_header(self):
         """Imprime el header de la aplicación."""
@@ -53,10 +68,10 @@ class MTGCalculator:
         print("2. Cargar mazo de ejemplo (Omnath)")
         print("3. Volver")
         
-        choice = input("\nElige una opción: ").strip()
+        choice = read_choice("\nElige una opción: ").strip()
         
         if choice == '1':
-            filepath = input("Ingresa la ruta del archivo: ").strip()
+            filepath = read_choice("Ingresa la ruta del archivo: ").strip()
             self.load_deck_from_file(filepath)
         elif choice == '2':
             self.load_example_deck()
@@ -80,8 +95,7 @@ class MTGCalculator:
         unique_names = MoxfieldParser.get_unique_cards(cards)
         
         # Consultar Scryfall
-        api = ScryfallAPI()
-        self.cards_data = api.get_multiple_cards(unique_names)
+        self.cards_data = self.get_api().get_multiple_cards(unique_names)
         
         # Crear lista expandida de cartas
         self.deck_cards = MoxfieldParser.get_card_list(cards)
@@ -102,15 +116,15 @@ class MTGCalculator:
         
         # Mazo de ejemplo simplificado
         example_cards = [
-            {'quantity': 1, 'name': 'Omnath, Locus of the Roil'},
-            {'quantity': 15, 'name': 'Island'},
-            {'quantity': 15, 'name': 'Forest'},
-            {'quantity': 7, 'name': 'Mountain'},
-            {'quantity': 5, 'name': 'Cultivate'},
-            {'quantity': 5, 'name': 'Risen Reef'},
-            {'quantity': 5, 'name': 'Lightning Bolt'},
-            {'quantity': 5, 'name': 'Counterspell'},
-            {'quantity': 42, 'name': 'Other Cards'},  # Placeholder
+            Card(1, 'Omnath, Locus of the Roil'),
+            Card(15, 'Island'),
+            Card(15, 'Forest'),
+            Card(7, 'Mountain'),
+            Card(5, 'Cultivate'),
+            Card(5, 'Risen Reef'),
+            Card(5, 'Lightning Bolt'),
+            Card(5, 'Counterspell'),
+            Card(42, 'Other Cards'),  # Placeholder
         ]
         
         unique_names = MoxfieldParser.get_unique_cards(example_cards)
@@ -118,8 +132,7 @@ class MTGCalculator:
         # Solo consultar cartas reales (no "Other Cards")
         real_cards = [name for name in unique_names if name != 'Other Cards']
         
-        api = ScryfallAPI()
-        self.cards_data = api.get_multiple_cards(real_cards)
+        self.cards_data = self.get_api().get_multiple_cards(real_cards)
         
         # Agregar placeholder para "Other Cards"
         self.cards_data['Other Cards'] = {
@@ -154,7 +167,7 @@ class MTGCalculator:
             print("5. Cálculo personalizado")
             print("6. Volver al menú principal")
             
-            choice = input("\nElige una opción: ").strip()
+            choice = read_choice("\nElige una opción: ").strip()
             
             if choice == '1':
                 self.calculate_lands_probability()
@@ -181,10 +194,10 @@ class MTGCalculator:
         
         print(f"\nEn mano inicial de {cards_drawn} cartas:")
         
-        results = []
-        for k in range(8):
-            prob = hypergeometric_probability(self.deck_size, lands_count, cards_drawn, k)
-            results.append([f"Exactamente {k}", format_percentage(prob)])
+        # Distribución completa de una vez; los k imposibles tienen probabilidad 0
+        distribution = dict(calculate_full_distribution(self.deck_size, lands_count, cards_drawn))
+        results = [[f"Exactamente {k}", format_percentage(distribution.get(k, 0.0))]
+                   for k in range(8)]
         
         print(tabulate(results, headers=["Escenario", "Probabilidad"], tablefmt="grid"))
         
@@ -209,7 +222,7 @@ class MTGCalculator:
             print(Fore.RED + "⚠️  No hay cartas de ramp detectadas en el mazo." + Style.RESET_ALL)
             return
         
-        cards_drawn = int(input("\n¿Hasta qué turno quieres calcular? (ej: 10 para primeros 10 robos): ").strip() or "10")
+        cards_drawn = int(read_choice("\n¿Hasta qué turno quieres calcular? (ej: 10 para primeros 10 robos): ").strip() or "10")
         
         print(f"\nEn los primeros {cards_drawn} robos:")
         
@@ -266,7 +279,7 @@ class MTGCalculator:
             print(Fore.RED + "⚠️  No hay interacción detectada en el mazo." + Style.RESET_ALL)
             return
         
-        cards_drawn = int(input("\n¿Cartas a robar? (default 7): ").strip() or "7")
+        cards_drawn = int(read_choice("\n¿Cartas a robar? (default 7): ").strip() or "7")
         
         print(f"\nEn {cards_drawn} cartas:")
         
@@ -285,9 +298,9 @@ class MTGCalculator:
         print(Fore.CYAN + "\n🎯 CÁLCULO PERSONALIZADO" + Style.RESET_ALL)
         
         try:
-            K = int(input(f"¿Cuántas cartas del tipo que buscas hay en el mazo? (de {self.deck_size}): ").strip())
-            n = int(input("¿Cuántas cartas vas a robar?: ").strip())
-            k = int(input("¿Cuántas de ese tipo quieres encontrar (mínimo)?: ").strip())
+            K = int(read_choice(f"¿Cuántas cartas del tipo que buscas hay en el mazo? (de {self.deck_size}): ").strip())
+            n = int(read_choice("¿Cuántas cartas vas a robar?: ").strip())
+            k = int(read_choice("¿Cuántas de ese tipo quieres encontrar (mínimo)?: ").strip())
             
             prob = probability_at_least(self.deck_size, K, n, k)
             
@@ -331,7 +344,7 @@ class MTGCalculator:
             print(Fore.CYAN + "6. 🔥 Filtros Avanzados (PRO)" + Style.RESET_ALL)
             print("7. Volver al menú principal")
             
-            choice = input("\nElige una opción: ").strip()
+            choice = read_choice("\nElige una opción: ").strip()
             
             if choice == '1':
                 lister.list_lands()
@@ -368,7 +381,7 @@ class MTGCalculator:
             print("5. Listar cartas")
             print("6. Salir")
             
-            choice = input("\nElige una opción: ").strip()
+            choice = read_choice("\nElige una opción: ").strip()
             
             if choice == '1':
                 self.load_deck_menu()
@@ -391,7 +404,8 @@ class MTGCalculator:
 
 
 def main():
-    calculator = MTGCalculator()
+    # --bulk: resolver las cartas con el archivo bulk diario de Scryfall
+    calculator = MTGCalculator(use_bulk='--bulk' in sys.argv[1:])
     calculator.main_menu()
 
 
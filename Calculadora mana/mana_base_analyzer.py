@@ -5,8 +5,132 @@ Calcula requisitos de color y sugiere distribución de tierras.
 
 from typing import Dict, List, Tuple
 from collections import Counter
+from functools import cached_property, lru_cache
+from itertools import combinations
+import math
+from types import MappingProxyType
 import re
-from colorama import Fore, Style
+
+from hypergeometric import calculate_full_distribution
+
+
+# Símbolos de maná entre llaves, ej: "{2}{G}{G/U}" -> ['2', 'G', 'G/U']
+_MANA_SYMBOL_RE = re.compile(r'\{([^}]+)\}')
+
+# Colores de maná
+MANA_COLORS = frozenset('WUBRG')
+
+# Datos vacíos (solo lectura) para cartas que no están en cards_data
+_NO_CARD_INFO = MappingProxyType({})
+
+# Tierras duales por par de colores
+SHOCK_LANDS = {
+    frozenset('GR'): 'Stomping Ground',
+    frozenset('GU'): 'Breeding Pool',
+    frozenset('RU'): 'Steam Vents',
+    frozenset('GW'): 'Temple Garden',
+    frozenset('RW'): 'Sacred Foundry',
+    frozenset('UW'): 'Hallowed Fountain',
+    frozenset('BG'): 'Overgrown Tomb',
+    frozenset('BR'): 'Blood Crypt',
+    frozenset('BU'): 'Watery Grave',
+    frozenset('BW'): 'Godless Shrine',
+}
+
+FETCH_LANDS = {
+    frozenset('GR'): 'Wooded Foothills',
+    frozenset('GU'): 'Misty Rainforest',
+    frozenset('RU'): 'Scalding Tarn',
+}
+
+# Tierras tricolor por combinación de 3 colores
+TRI_LANDS = {
+    frozenset('GRU'): ['Frontier Bivouac', 'Ketria Triome'],
+}
+
+
+@lru_cache(maxsize=64)
+def _land_prob_bins(land_count: int, deck_size: int = 99,
+                    hand_size: int = 7) -> Tuple[float, float, float]:
+    """
+    Probabilidades de la mano inicial agrupadas por cantidad de tierras.
+    Se guardan por (land_count, deck_size, hand_size) para reanálisis.
+    
+    Args:
+        land_count: Tierras en el mazo
+        deck_size: Tamaño del mazo (99 en Commander sin comandante)
+        hand_size: Tamaño de la mano inicial
+    
+    Returns:
+        Tupla (P(0-1 tierras), P(2-4 tierras), P(5+ tierras))
+    """
+    # Distribución completa de una vez: P(k tierras) en la posición k
+    pmf = [prob for _, prob in calculate_full_distribution(deck_size, land_count, hand_size)]
+    
+    return sum(pmf[:2], 0.0), sum(pmf[2:5], 0.0), sum(pmf[5:], 0.0)
+
+
+# Marcos del reporte de print_recommendations (60 columnas)
+_REPORT_TOP = "\n╔" + "═" * 58 + "╗"
+_REPORT_TITLE = f"║ {'📊 ANÁLISIS DE BASE DE MANÁ':^56} ║"
+_REPORT_BOTTOM = "╚" + "═" * 58 + "╝"
+_REPORT_END = "═" * 60
+_SECTION_END = "└" + "─" * 59 + "┘"
+
+# Encabezados de sección, rellenos hasta el borde derecho
+_SECTION_CURRENT = "\n┌─ 🏞️  ESTADO ACTUAL" + " " * 38 + "┐"
+_SECTION_OPTIMAL = "\n┌─ 🎯 RECOMENDACIÓN ÓPTIMA" + " " * 33 + "┐"
+_SECTION_PROBABILITIES = "\n┌─ 🎲 PROBABILIDADES (Mano Inicial)" + " " * 22 + "┐"
+_SECTION_FIXING = "\n┌─ 🌈 COLOR FIXING" + " " * 41 + "┐"
+_SECTION_RAMP = "\n┌─ 💎 ANÁLISIS DE RAMP" + " " * 37 + "┐"
+
+# Subtipos de tierra básica y el color que producen
+_BASIC_TOKENS = (
+    ('forest', 'G'),
+    ('island', 'U'),
+    ('mountain', 'R'),
+    ('plains', 'W'),
+    ('swamp', 'B'),
+)
+
+
+@lru_cache(maxsize=None)
+def _basic_land_colors(type_line: str) -> Tuple[str, ...]:
+    """
+    Colores de los subtipos básicos de una línea de tipo.
+    Ejemplo: 'Land — Forest Island' -> ('G', 'U')
+    
+    Args:
+        type_line: Línea de tipo de la carta
+    
+    Returns:
+        Tupla de colores (vacía si no tiene subtipos básicos)
+    """
+    type_line = type_line.lower()
+    return tuple(color for basic, color in _BASIC_TOKENS if basic in type_line)
+
+
+@lru_cache(maxsize=None)
+def _symbol_pips(symbol: str) -> Tuple[Tuple[str, float], ...]:
+    """
+    Clasifica un símbolo de maná una sola vez y devuelve su aporte por color.
+    Ejemplo: 'G' -> (('G', 1),), 'G/U' -> (('G', 0.5), ('U', 0.5))
+    
+    Args:
+        symbol: Símbolo sin llaves
+    
+    Returns:
+        Tupla de pares (color, cantidad)
+    """
+    # Símbolos de un solo color
+    if symbol in MANA_COLORS:
+        return ((symbol, 1),)
+    
+    # Símbolos híbridos (ej: {G/U}), medio símbolo cada color
+    if '/' in symbol:
+        return tuple((color, 0.5) for color in symbol.split('/') if color in MANA_COLORS)
+    
+    return ()
 
 
 class ManaBaseAnalyzer:
@@ -21,7 +145,43 @@ class ManaBaseAnalyzer:
         """
         self.cards_data = cards_data
         self.deck_list = deck_list
-        self.color_requirements = self._calculate_color_requirements()
+        self._build_card_caches()
+    
+    def _build_card_caches(self):
+        """
+        Recorre el mazo una sola vez y guarda lo que usan los análisis:
+        datos de tierras y no tierras, costos de maná ya parseados y CMC.
+        
+        Las copias repetidas (ej: 30 Island) se agrupan por nombre, así que
+        cada lista guarda pares (dato, cantidad) por carta distinta.
+        """
+        self._grouped = Counter(self.deck_list)
+        cards_data = self.cards_data
+        land_infos = []
+        nonland_infos = []
+        
+        for card_name, quantity in self._grouped.items():
+            card_info = cards_data.get(card_name, _NO_CARD_INFO)
+            if card_info.get('is_land', False):
+                land_infos.append((card_info, quantity))
+            else:
+                nonland_infos.append((card_info, quantity))
+        
+        # Cada costo de maná distinto se parsea una sola vez
+        parsed_costs = {}
+        nonland_parsed = []
+        for card_info, quantity in nonland_infos:
+            mana_cost = card_info.get('mana_cost', '')
+            if mana_cost not in parsed_costs:
+                parsed_costs[mana_cost] = self._parse_mana_cost(mana_cost) if mana_cost else {}
+            nonland_parsed.append((parsed_costs[mana_cost], quantity))
+        
+        self._land_infos = land_infos
+        self._nonland_infos = nonland_infos
+        self._nonland_parsed = nonland_parsed
+        self._nonland_cmcs = [(card_info.get('cmc', 0), quantity)
+                              for card_info, quantity in nonland_infos]
+        self._nonland_total = sum(quantity for _, quantity in nonland_infos)
     
     def _parse_mana_cost(self, mana_cost: str) -> Dict[str, int]:
         """
@@ -36,52 +196,91 @@ class ManaBaseAnalyzer:
         """
         color_counts = Counter()
         
-        # Extraer todos los símbolos entre llaves
-        symbols = re.findall(r'\{([^}]+)\}', mana_cost)
-        
-        for symbol in symbols:
-            # Símbolos de un solo color
-            if symbol in ['W', 'U', 'B', 'R', 'G']:
-                color_counts[symbol] += 1
-            
-            # Símbolos híbridos (ej: {G/U})
-            elif '/' in symbol:
-                colors = symbol.split('/')
-                for color in colors:
-                    if color in ['W', 'U', 'B', 'R', 'G']:
-                        color_counts[color] += 0.5  # Contar como medio símbolo cada uno
-            
-            # Símbolos de Phyrexian (ej: {G/P})
-            elif '/P' in symbol:
-                color = symbol.replace('/P', '')
-                if color in ['W', 'U', 'B', 'R', 'G']:
-                    color_counts[color] += 1
+        # Extraer todos los símbolos entre llaves; cada símbolo distinto
+        # se clasifica una sola vez en _symbol_pips
+        for symbol in _MANA_SYMBOL_RE.findall(mana_cost):
+            for color, amount in _symbol_pips(symbol):
+                color_counts[color] += amount
         
         return dict(color_counts)
     
-    def _calculate_color_requirements(self) -> Dict[str, float]:
+    # Agregados del mazo: se calculan la primera vez que se piden y se
+    # reutilizan en recommend_land_distribution y print_recommendations
+    
+    @cached_property
+    def color_requirements(self) -> Dict[str, float]:
+        """Requisitos totales de color: {color: total_símbolos}."""
+        return self._calculate_color_requirements()
+    
+    @cached_property
+    def color_percentages(self) -> Dict[str, float]:
+        """Porcentaje de cada color: {color: porcentaje}."""
+        total_symbols = sum(self.color_requirements.values())
+        
+        if total_symbols == 0:
+            return {}
+        
+        percentages = {}
+        for color, count in self.color_requirements.items():
+            percentages[color] = (count / total_symbols) * 100
+        
+        return percentages
+    
+    @cached_property
+    def current_lands(self) -> Dict:
+        """Tierras actuales: total, básicas por color y duales."""
+        return self._calculate_current_lands()
+    
+    @cached_property
+    def avg_cmc(self) -> float:
+        """CMC promedio sin tierras."""
+        return self._calculate_avg_cmc()
+    
+    @cached_property
+    def ramp_count(self) -> int:
+        """Cantidad de cartas de ramp."""
+        return self._count_ramp_cards()
+    
+    @cached_property
+    def color_pips(self) -> Dict[str, int]:
+        """Cartas exigentes (2+ símbolos del mismo color) por color."""
+        return self._analyze_color_pips()
+    
+    @cached_property
+    def early_game(self) -> Dict:
+        """Cantidad de cartas de CMC 1-2."""
+        return self._analyze_early_game()
+    
+    @cached_property
+    def _color_totals(self) -> Tuple[Dict[str, float], Dict[str, int]]:
         """
-        Calcula los requisitos totales de color del mazo.
+        Recorre una sola vez los costos parseados y acumula a la vez los
+        requisitos de color y las cartas exigentes (pips).
         
         Returns:
-            Diccionario {color: total_símbolos}
+            Tupla ({color: total_símbolos}, {color: cartas_exigentes})
         """
         total_requirements = Counter()
+        demanding_cards = Counter()
         
-        for card_name in self.deck_list:
-            card_info = self.cards_data.get(card_name, {})
-            
-            # Solo contar cartas que no son tierras
-            if card_info.get('is_land', False):
-                continue
-            
-            mana_cost = card_info.get('mana_cost', '')
-            if mana_cost:
-                color_counts = self._parse_mana_cost(mana_cost)
-                for color, count in color_counts.items():
-                    total_requirements[color] += count
+        # Solo contar cartas que no son tierras
+        for color_counts, quantity in self._nonland_parsed:
+            for color, count in color_counts.items():
+                total_requirements[color] += count * quantity
+                # Detectar cartas exigentes (2+ símbolos del mismo color)
+                if count >= 2:
+                    demanding_cards[color] += quantity
+        
+        return dict(total_requirements), dict(demanding_cards)
+    
+    def _calculate_color_requirements(self) -> Dict[str, float]:
+        """
+        Calcula los requisitos totales de color del mazo.
         
-        return dict(total_requirements)
+        Returns:
+            Diccionario {color: total_símbolos}
+        """
+        return self._color_totals[0]
     
     def get_color_percentages(self) -> Dict[str, float]:
         """
@@ -90,16 +289,7 @@ class ManaBaseAnalyzer:
         Returns:
             Diccionario {color: porcentaje}
         """
-        total_symbols = sum(self.color_requirements.values())
-        
-        if total_symbols == 0:
-            return {}
-        
-        percentages = {}
-        for color, count in self.color_requirements.items():
-            percentages[color] = (count / total_symbols) * 100
-        
-        return percentages
+        return self.color_percentages
     
     def recommend_land_distribution(self, total_lands: int = 37) -> Dict[str, any]:
         """
@@ -111,7 +301,7 @@ class ManaBaseAnalyzer:
         Returns:
             Diccionario con recomendaciones
         """
-        percentages = self.get_color_percentages()
+        percentages = self.color_percentages
         
         if not percentages:
             return {
@@ -122,20 +312,20 @@ class ManaBaseAnalyzer:
         utility_lands = 10
         colored_lands = total_lands - utility_lands
         
-        # Calcular tierras básicas según porcentaje
+        # Calcular tierras básicas según porcentaje (método del resto mayor):
+        # cada color recibe la parte entera de su cuota...
         basic_lands = {}
+        remainders = {}
         for color, percentage in percentages.items():
-            count = round((percentage / 100) * colored_lands)
-            basic_lands[color] = count
-        
-        # Ajustar si la suma no da exacta
-        total_allocated = sum(basic_lands.values())
-        difference = colored_lands - total_allocated
+            share = (percentage / 100) * colored_lands
+            basic_lands[color] = math.floor(share)
+            remainders[color] = share - basic_lands[color]
         
-        if difference != 0 and basic_lands:
-            # Agregar/quitar del color dominante
-            dominant_color = max(basic_lands, key=basic_lands.get)
-            basic_lands[dominant_color] += difference
+        # ...y las tierras que sobran van a los de mayor parte decimal
+        leftover = colored_lands - sum(basic_lands.values())
+        if leftover > 0:
+            for color in sorted(remainders, key=remainders.get, reverse=True)[:leftover]:
+                basic_lands[color] += 1
         
         # Recomendaciones de tierras duales
         dual_recommendations = self._recommend_dual_lands()
@@ -169,41 +359,21 @@ class ManaBaseAnalyzer:
             'tri_lands': []
         }
         
-        # Mapeo de pares de colores a nombres de tierras
-        shock_lands_map = {
-            ('G', 'R'): 'Stomping Ground',
-            ('G', 'U'): 'Breeding Pool',
-            ('R', 'U'): 'Steam Vents',
-            ('G', 'W'): 'Temple Garden',
-            ('R', 'W'): 'Sacred Foundry',
-            ('U', 'W'): 'Hallowed Fountain',
-            ('B', 'G'): 'Overgrown Tomb',
-            ('B', 'R'): 'Blood Crypt',
-            ('B', 'U'): 'Watery Grave',
-            ('B', 'W'): 'Godless Shrine'
-        }
-        
-        fetch_lands_map = {
-            ('G', 'R'): 'Wooded Foothills',
-            ('G', 'U'): 'Misty Rainforest',
-            ('R', 'U'): 'Scalding Tarn',
-        }
-        
         # Recomendar shocks y fetches para cada par de colores
-        for i, color1 in enumerate(colors):
-            for color2 in colors[i+1:]:
-                pair = tuple(sorted([color1, color2]))
-                
-                if pair in shock_lands_map:
-                    recommendations['shock_lands'].append(shock_lands_map[pair])
-                
-                if pair in fetch_lands_map:
-                    recommendations['fetch_lands'].append(fetch_lands_map[pair])
+        for pair in combinations(colors, 2):
+            pair = frozenset(pair)
+            
+            if pair in SHOCK_LANDS:
+                recommendations['shock_lands'].append(SHOCK_LANDS[pair])
+            
+            if pair in FETCH_LANDS:
+                recommendations['fetch_lands'].append(FETCH_LANDS[pair])
         
         # Tierras tricolor para mazos de 3 colores
         if len(colors) == 3:
-            if set(colors) == {'G', 'R', 'U'}:
-                recommendations['tri_lands'] = ['Frontier Bivouac', 'Ketria Triome']
+            tri_lands = TRI_LANDS.get(frozenset(colors))
+            if tri_lands:
+                recommendations['tri_lands'] = list(tri_lands)
         
         return recommendations
     
@@ -213,95 +383,45 @@ class ManaBaseAnalyzer:
         colored = Counter()
         dual_lands = 0
         
-        for card_name in self.deck_list:
-            card_info = self.cards_data.get(card_name, {})
-            if card_info.get('is_land', False):
-                total += 1
-                # Contar tierras de color
-                type_line = card_info.get('type_line', '').lower()
-                if any(basic in type_line for basic in ['forest', 'island', 'mountain', 'plains', 'swamp']):
-                    if 'forest' in type_line:
-                        colored['G'] += 1
-                    if 'island' in type_line:
-                        colored['U'] += 1
-                    if 'mountain' in type_line:
-                        colored['R'] += 1
-                    if 'plains' in type_line:
-                        colored['W'] += 1
-                    if 'swamp' in type_line:
-                        colored['B'] += 1
-                # Contar duales (tierras que producen 2+ colores)
-                colors = card_info.get('color_identity', [])
-                if len(colors) >= 2:
-                    dual_lands += 1
+        for card_info, quantity in self._land_infos:
+            total += quantity
+            # Contar tierras de color
+            # Las básicas repiten la misma línea de tipo: se clasifica una vez
+            for color in _basic_land_colors(card_info.get('type_line', '')):
+                colored[color] += quantity
+            # Contar duales (tierras que producen 2+ colores)
+            colors = card_info.get('color_identity', [])
+            if len(colors) >= 2:
+                dual_lands += quantity
         
         return {'total': total, 'colored': dict(colored), 'dual_lands': dual_lands}
     
     def _calculate_avg_cmc(self) -> float:
         """Calcula el CMC promedio del mazo (sin tierras)."""
-        cmcs = []
-        for card_name in self.deck_list:
-            card_info = self.cards_data.get(card_name, {})
-            if not card_info.get('is_land', False):
-                cmcs.append(card_info.get('cmc', 0))
-        return sum(cmcs) / len(cmcs) if cmcs else 0
+        if not self._nonland_total:
+            return 0
+        return sum(cmc * quantity for cmc, quantity in self._nonland_cmcs) / self._nonland_total
     
     def _count_ramp_cards(self) -> int:
         """Cuenta cartas de ramp en el mazo."""
-        ramp_count = 0
-        for card_name in self.deck_list:
-            card_info = self.cards_data.get(card_name, {})
-            if card_info.get('is_ramp', False):
-                ramp_count += 1
-        return ramp_count
+        return sum(quantity for card_infos in (self._land_infos, self._nonland_infos)
+                   for card_info, quantity in card_infos if card_info.get('is_ramp', False))
     
     def _analyze_color_pips(self) -> Dict[str, int]:
         """Analiza cartas con múltiples símbolos del mismo color (pips)."""
-        demanding_cards = Counter()
-        
-        for card_name in self.deck_list:
-            card_info = self.cards_data.get(card_name, {})
-            if card_info.get('is_land', False):
-                continue
-            
-            mana_cost = card_info.get('mana_cost', '')
-            color_counts = self._parse_mana_cost(mana_cost)
-            
-            # Detectar cartas exigentes (2+ símbolos del mismo color)
-            for color, count in color_counts.items():
-                if count >= 2:
-                    demanding_cards[color] += 1
-        
-        return dict(demanding_cards)
+        return self._color_totals[1]
     
     def _analyze_early_game(self) -> Dict:
         """Analiza la curva temprana del mazo."""
-        early_cards = 0  # CMC 1-2
-        
-        for card_name in self.deck_list:
-            card_info = self.cards_data.get(card_name, {})
-            if not card_info.get('is_land', False):
-                cmc = card_info.get('cmc', 0)
-                if cmc <= 2:
-                    early_cards += 1
+        # CMC 1-2
+        early_cards = sum(quantity for cmc, quantity in self._nonland_cmcs if cmc <= 2)
         
         return {'early_cards': early_cards}
     
     def _calculate_land_probabilities(self, land_count: int) -> Dict[str, float]:
         """Calcula probabilidades de tierras con hipergeométrica."""
-        from hypergeometric import probability_at_least, probability_between
-        
-        deck_size = 99  # Commander sin comandante
-        hand_size = 7
-        
-        # P(0-1 tierras) = Mana Screw
-        mana_screw = probability_at_least(deck_size, land_count, hand_size, 0) - probability_at_least(deck_size, land_count, hand_size, 2)
-        
-        # P(2-4 tierras) = Keepable
-        keepable = probability_between(deck_size, land_count, hand_size, 2, 4)
-        
-        # P(5+ tierras) = Mana Flood
-        mana_flood = probability_at_least(deck_size, land_count, hand_size, 5)
+        # Mana Screw (0-1 tierras), Keepable (2-4) y Mana Flood (5+)
+        mana_screw, keepable, mana_flood = _land_prob_bins(land_count)
         
         return {
             'mana_screw': mana_screw * 100,
@@ -313,11 +433,14 @@ class ManaBaseAnalyzer:
         """
         Análisis completo de base de maná basado en CMC y probabilidades.
         """
+        # colorama solo hace falta para imprimir el reporte
+        from colorama import Fore, Style
+        
         # Recolectar datos
-        current_lands = self._calculate_current_lands()
-        avg_cmc = self._calculate_avg_cmc()
-        ramp_count = self._count_ramp_cards()
-        percentages = self.get_color_percentages()
+        current_lands = self.current_lands
+        avg_cmc = self.avg_cmc
+        ramp_count = self.ramp_count
+        percentages = self.color_percentages
         num_colors = len(percentages)
         
         # Calcular tierras óptimas basado en CMC
@@ -343,26 +466,28 @@ class ManaBaseAnalyzer:
         current_total = current_lands['total']
         difference = optimal_lands - current_total
         
+        out = []
+        
         # ═══════════════════════════════════════════════════════
         # HEADER PRINCIPAL
         # ═══════════════════════════════════════════════════════
-        print(Fore.CYAN + "\n╔" + "═" * 58 + "╗")
-        print(f"║ {'📊 ANÁLISIS DE BASE DE MANÁ':^56} ║")
-        print("╚" + "═" * 58 + "╝" + Style.RESET_ALL)
+        out.append(Fore.CYAN + _REPORT_TOP)
+        out.append(_REPORT_TITLE)
+        out.append(_REPORT_BOTTOM + Style.RESET_ALL)
         
         # ═══════════════════════════════════════════════════════
         # 1. ESTADO ACTUAL
         # ═══════════════════════════════════════════════════════
-        print(Fore.YELLOW + "\n┌─ 🏞️  ESTADO ACTUAL" + " " * 38 + "┐" + Style.RESET_ALL)
-        print(f"{Fore.CYAN}│ Tierras totales: {Fore.WHITE}{current_total}{Fore.CYAN}")
-        print(f"│ Tierras duales/fetches: {Fore.WHITE}{current_lands['dual_lands']}{Fore.CYAN}")
-        print(f"│ Número de colores: {Fore.WHITE}{num_colors}{Fore.CYAN}")
-        print(Fore.YELLOW + "└" + "─" * 59 + "┘" + Style.RESET_ALL)
+        out.append(Fore.YELLOW + _SECTION_CURRENT + Style.RESET_ALL)
+        out.append(f"{Fore.CYAN}│ Tierras totales: {Fore.WHITE}{current_total}{Fore.CYAN}")
+        out.append(f"│ Tierras duales/fetches: {Fore.WHITE}{current_lands['dual_lands']}{Fore.CYAN}")
+        out.append(f"│ Número de colores: {Fore.WHITE}{num_colors}{Fore.CYAN}")
+        out.append(Fore.YELLOW + _SECTION_END + Style.RESET_ALL)
         
         # ═══════════════════════════════════════════════════════
         # 2. RECOMENDACIÓN ÓPTIMA
         # ═══════════════════════════════════════════════════════
-        print(Fore.YELLOW + "\n┌─ 🎯 RECOMENDACIÓN ÓPTIMA" + " " * 33 + "┐" + Style.RESET_ALL)
+        out.append(Fore.YELLOW + _SECTION_OPTIMAL + Style.RESET_ALL)
         
         # Calcular distribución ideal basada en porcentajes de color
         recommendations = self.recommend_land_distribution(optimal_lands)
@@ -370,8 +495,8 @@ class ManaBaseAnalyzer:
         current_colored = current_lands['colored']
         
         if difference > 0:
-            print(f"{Fore.RED}│ ⚠️  AÑADIR {Fore.WHITE}{difference} TIERRAS{Fore.RED} ({current_total} → {optimal_lands})")
-            print(f"{Fore.CYAN}│")
+            out.append(f"{Fore.RED}│ ⚠️  AÑADIR {Fore.WHITE}{difference} TIERRAS{Fore.RED} ({current_total} → {optimal_lands})")
+            out.append(f"{Fore.CYAN}│")
             
             # Calcular déficit por color
             color_deficits = []
@@ -397,18 +522,18 @@ class ManaBaseAnalyzer:
                     remaining -= to_add
             
             if lands_to_add:
-                print(f"│ 📋 {Fore.WHITE}" + ", ".join(lands_to_add) + Fore.CYAN)
+                out.append(f"│ 📋 {Fore.WHITE}" + ", ".join(lands_to_add) + Fore.CYAN)
             else:
                 # Si no hay déficit de básicas, recomendar duales
                 dual_count = current_lands['dual_lands']
                 if dual_count < 8:
-                    print(f"│ 📋 {Fore.WHITE}Tierras duales (tienes {dual_count}, necesitas ~8){Fore.CYAN}")
+                    out.append(f"│ 📋 {Fore.WHITE}Tierras duales (tienes {dual_count}, necesitas ~8){Fore.CYAN}")
                 else:
-                    print(f"│ 📋 {Fore.WHITE}Tierras de utilidad o duales{Fore.CYAN}")
+                    out.append(f"│ 📋 {Fore.WHITE}Tierras de utilidad o duales{Fore.CYAN}")
                     
         elif difference < 0:
-            print(f"{Fore.YELLOW}│ ⚠️  QUITAR {Fore.WHITE}{abs(difference)} TIERRAS{Fore.YELLOW} ({current_total} → {optimal_lands})")
-            print(f"{Fore.CYAN}│")
+            out.append(f"{Fore.YELLOW}│ ⚠️  QUITAR {Fore.WHITE}{abs(difference)} TIERRAS{Fore.YELLOW} ({current_total} → {optimal_lands})")
+            out.append(f"{Fore.CYAN}│")
             
             # Calcular exceso por color
             color_surplus = []
@@ -434,112 +559,115 @@ class ManaBaseAnalyzer:
                     remaining -= to_remove
             
             if lands_to_remove:
-                print(f"│ 📋 {Fore.WHITE}" + ", ".join(lands_to_remove) + Fore.CYAN)
+                out.append(f"│ 📋 {Fore.WHITE}" + ", ".join(lands_to_remove) + Fore.CYAN)
             else:
-                print(f"│ 📋 {Fore.WHITE}Tierras de utilidad o excedentes{Fore.CYAN}")
+                out.append(f"│ 📋 {Fore.WHITE}Tierras de utilidad o excedentes{Fore.CYAN}")
         else:
-            print(f"{Fore.GREEN}│ ✅ CANTIDAD PERFECTA ({current_total} tierras)")
+            out.append(f"{Fore.GREEN}│ ✅ CANTIDAD PERFECTA ({current_total} tierras)")
         
-        print(f"{Fore.CYAN}│")
-        print(f"│ 📈 CMC Promedio: {Fore.WHITE}{avg_cmc:.2f}{Fore.CYAN}")
+        out.append(f"{Fore.CYAN}│")
+        out.append(f"│ 📈 CMC Promedio: {Fore.WHITE}{avg_cmc:.2f}{Fore.CYAN}")
         
         # Explicar por qué esta cantidad
         if avg_cmc >= 3.5:
-            print(f"│    → CMC alto (≥3.5) requiere {Fore.WHITE}38 tierras base{Fore.CYAN}")
+            out.append(f"│    → CMC alto (≥3.5) requiere {Fore.WHITE}38 tierras base{Fore.CYAN}")
         elif avg_cmc >= 3.0:
-            print(f"│    → CMC medio (≥3.0) requiere {Fore.WHITE}37 tierras base{Fore.CYAN}")
+            out.append(f"│    → CMC medio (≥3.0) requiere {Fore.WHITE}37 tierras base{Fore.CYAN}")
         else:
-            print(f"│    → CMC bajo (<3.0) requiere {Fore.WHITE}36 tierras base{Fore.CYAN}")
+            out.append(f"│    → CMC bajo (<3.0) requiere {Fore.WHITE}36 tierras base{Fore.CYAN}")
         
         if ramp_adjustment != 0:
             sign = "+" if ramp_adjustment > 0 else ""
-            print(f"│    → Ajuste por ramp: {Fore.WHITE}{sign}{ramp_adjustment} tierras{Fore.CYAN}")
+            out.append(f"│    → Ajuste por ramp: {Fore.WHITE}{sign}{ramp_adjustment} tierras{Fore.CYAN}")
         
-        print(Fore.YELLOW + "└" + "─" * 59 + "┘" + Style.RESET_ALL)
+        out.append(Fore.YELLOW + _SECTION_END + Style.RESET_ALL)
         
         # ═══════════════════════════════════════════════════════
         # 3. PROBABILIDADES (HIPERGEOMÉTRICA)
         # ═══════════════════════════════════════════════════════
-        print(Fore.YELLOW + "\n┌─ 🎲 PROBABILIDADES (Mano Inicial)" + " " * 22 + "┐" + Style.RESET_ALL)
+        out.append(Fore.YELLOW + _SECTION_PROBABILITIES + Style.RESET_ALL)
         
         if current_total > 0:
             current_probs = self._calculate_land_probabilities(current_total)
             
-            print(f"{Fore.CYAN}│ Con {Fore.WHITE}{current_total} tierras{Fore.CYAN}:")
-            print(f"│   {Fore.RED}Mana Screw (0-1): {current_probs['mana_screw']:>5.1f}%{Fore.CYAN}")
-            print(f"│   {Fore.GREEN}Keepable (2-4):   {current_probs['keepable']:>5.1f}%{Fore.CYAN}")
-            print(f"│   {Fore.YELLOW}Mana Flood (5+):  {current_probs['mana_flood']:>5.1f}%{Fore.CYAN}")
+            out.append(f"{Fore.CYAN}│ Con {Fore.WHITE}{current_total} tierras{Fore.CYAN}:")
+            out.append(f"│   {Fore.RED}Mana Screw (0-1): {current_probs['mana_screw']:>5.1f}%{Fore.CYAN}")
+            out.append(f"│   {Fore.GREEN}Keepable (2-4):   {current_probs['keepable']:>5.1f}%{Fore.CYAN}")
+            out.append(f"│   {Fore.YELLOW}Mana Flood (5+):  {current_probs['mana_flood']:>5.1f}%{Fore.CYAN}")
             
             # Comparar con óptimo si es diferente
             if difference != 0:
                 optimal_probs = self._calculate_land_probabilities(optimal_lands)
-                print(f"{Fore.CYAN}│")
-                print(f"│ Con {Fore.WHITE}{optimal_lands} tierras{Fore.CYAN} (recomendado):")
-                print(f"│   {Fore.RED}Mana Screw (0-1): {optimal_probs['mana_screw']:>5.1f}%{Fore.CYAN}")
-                print(f"│   {Fore.GREEN}Keepable (2-4):   {optimal_probs['keepable']:>5.1f}%{Fore.CYAN}")
-                print(f"│   {Fore.YELLOW}Mana Flood (5+):  {optimal_probs['mana_flood']:>5.1f}%{Fore.CYAN}")
+                out.append(f"{Fore.CYAN}│")
+                out.append(f"│ Con {Fore.WHITE}{optimal_lands} tierras{Fore.CYAN} (recomendado):")
+                out.append(f"│   {Fore.RED}Mana Screw (0-1): {optimal_probs['mana_screw']:>5.1f}%{Fore.CYAN}")
+                out.append(f"│   {Fore.GREEN}Keepable (2-4):   {optimal_probs['keepable']:>5.1f}%{Fore.CYAN}")
+                out.append(f"│   {Fore.YELLOW}Mana Flood (5+):  {optimal_probs['mana_flood']:>5.1f}%{Fore.CYAN}")
                 
                 # Mostrar mejora
                 screw_diff = current_probs['mana_screw'] - optimal_probs['mana_screw']
                 keepable_diff = optimal_probs['keepable'] - current_probs['keepable']
                 
-                print(f"{Fore.CYAN}│")
+                out.append(f"{Fore.CYAN}│")
                 if difference > 0:  # Necesita añadir tierras
-                    print(f"│ 💡 {Fore.GREEN}Mejora: {abs(screw_diff):.1f}% menos mana screw{Fore.CYAN}")
+                    out.append(f"│ 💡 {Fore.GREEN}Mejora: {abs(screw_diff):.1f}% menos mana screw{Fore.CYAN}")
                 else:  # Necesita quitar tierras
-                    print(f"│ 💡 {Fore.GREEN}Mejora: {abs(keepable_diff):.1f}% más keepable{Fore.CYAN}")
+                    out.append(f"│ 💡 {Fore.GREEN}Mejora: {abs(keepable_diff):.1f}% más keepable{Fore.CYAN}")
         
-        print(Fore.YELLOW + "└" + "─" * 59 + "┘" + Style.RESET_ALL)
+        out.append(Fore.YELLOW + _SECTION_END + Style.RESET_ALL)
         
         # ═══════════════════════════════════════════════════════
         # 4. COLOR FIXING
         # ═══════════════════════════════════════════════════════
-        print(Fore.YELLOW + "\n┌─ 🌈 COLOR FIXING" + " " * 41 + "┐" + Style.RESET_ALL)
+        out.append(Fore.YELLOW + _SECTION_FIXING + Style.RESET_ALL)
         
         dual_count = current_lands['dual_lands']
         
         if num_colors == 1:
-            print(f"{Fore.GREEN}│ ✅ Mazo monocolor - No necesitas tierras duales")
+            out.append(f"{Fore.GREEN}│ ✅ Mazo monocolor - No necesitas tierras duales")
         elif num_colors == 2:
             if dual_count >= 8:
-                print(f"{Fore.GREEN}│ ✅ {dual_count} duales - Excelente para 2 colores")
+                out.append(f"{Fore.GREEN}│ ✅ {dual_count} duales - Excelente para 2 colores")
             elif dual_count >= 5:
-                print(f"{Fore.YELLOW}│ ⚠️  {dual_count} duales - Decente (objetivo: 8-10)")
+                out.append(f"{Fore.YELLOW}│ ⚠️  {dual_count} duales - Decente (objetivo: 8-10)")
             else:
-                print(f"{Fore.RED}│ ❌ {dual_count} duales - INSUFICIENTE para 2 colores")
-                print(f"{Fore.CYAN}│    💡 Añade {Fore.WHITE}{8 - dual_count} duales más{Fore.CYAN} (objetivo: 8-10)")
+                out.append(f"{Fore.RED}│ ❌ {dual_count} duales - INSUFICIENTE para 2 colores")
+                out.append(f"{Fore.CYAN}│    💡 Añade {Fore.WHITE}{8 - dual_count} duales más{Fore.CYAN} (objetivo: 8-10)")
         elif num_colors >= 3:
             if dual_count >= 12:
-                print(f"{Fore.GREEN}│ ✅ {dual_count} duales - Excelente para {num_colors} colores")
+                out.append(f"{Fore.GREEN}│ ✅ {dual_count} duales - Excelente para {num_colors} colores")
             elif dual_count >= 8:
-                print(f"{Fore.YELLOW}│ ⚠️  {dual_count} duales - Justo (objetivo: 12-15)")
+                out.append(f"{Fore.YELLOW}│ ⚠️  {dual_count} duales - Justo (objetivo: 12-15)")
             else:
-                print(f"{Fore.RED}│ ❌ {dual_count} duales - MUY POCO para {num_colors} colores")
-                print(f"{Fore.CYAN}│    💡 Añade {Fore.WHITE}{12 - dual_count} duales más{Fore.CYAN} (objetivo: 12-15)")
+                out.append(f"{Fore.RED}│ ❌ {dual_count} duales - MUY POCO para {num_colors} colores")
+                out.append(f"{Fore.CYAN}│    💡 Añade {Fore.WHITE}{12 - dual_count} duales más{Fore.CYAN} (objetivo: 12-15)")
         
-        print(Fore.YELLOW + "└" + "─" * 59 + "┘" + Style.RESET_ALL)
+        out.append(Fore.YELLOW + _SECTION_END + Style.RESET_ALL)
         
         # ═══════════════════════════════════════════════════════
         # 5. ANÁLISIS DE RAMP
         # ═══════════════════════════════════════════════════════
-        print(Fore.YELLOW + "\n┌─ 💎 ANÁLISIS DE RAMP" + " " * 37 + "┐" + Style.RESET_ALL)
+        out.append(Fore.YELLOW + _SECTION_RAMP + Style.RESET_ALL)
         
-        print(f"{Fore.CYAN}│ Cartas de ramp: {Fore.WHITE}{ramp_count}{Fore.CYAN}")
+        out.append(f"{Fore.CYAN}│ Cartas de ramp: {Fore.WHITE}{ramp_count}{Fore.CYAN}")
         
         if ramp_count >= 12:
-            print(f"│ {Fore.GREEN}✅ Excelente aceleración (≥12)")
-            print(f"{Fore.CYAN}│    💡 Alto ramp permite {Fore.WHITE}-2 tierras{Fore.CYAN}")
+            out.append(f"│ {Fore.GREEN}✅ Excelente aceleración (≥12)")
+            out.append(f"{Fore.CYAN}│    💡 Alto ramp permite {Fore.WHITE}-2 tierras{Fore.CYAN}")
         elif ramp_count >= 8:
-            print(f"│ {Fore.GREEN}✅ Cantidad estándar (8-11)")
-            print(f"{Fore.CYAN}│    💡 Buen ramp permite {Fore.WHITE}-1 tierra{Fore.CYAN}")
+            out.append(f"│ {Fore.GREEN}✅ Cantidad estándar (8-11)")
+            out.append(f"{Fore.CYAN}│    💡 Buen ramp permite {Fore.WHITE}-1 tierra{Fore.CYAN}")
         elif ramp_count >= 5:
-            print(f"│ {Fore.YELLOW}⚠️  Un poco bajo (5-7)")
-            print(f"{Fore.CYAN}│    💡 Sin ajuste de tierras")
+            out.append(f"│ {Fore.YELLOW}⚠️  Un poco bajo (5-7)")
+            out.append(f"{Fore.CYAN}│    💡 Sin ajuste de tierras")
         else:
-            print(f"│ {Fore.RED}❌ MUY BAJO (<5)")
-            print(f"{Fore.CYAN}│    💡 Poco ramp requiere {Fore.WHITE}+1 tierra{Fore.CYAN}")
-            print(f"│    💡 O añade {Fore.WHITE}{8 - ramp_count} ramps más{Fore.CYAN}")
+            out.append(f"│ {Fore.RED}❌ MUY BAJO (<5)")
+            out.append(f"{Fore.CYAN}│    💡 Poco ramp requiere {Fore.WHITE}+1 tierra{Fore.CYAN}")
+            out.append(f"│    💡 O añade {Fore.WHITE}{8 - ramp_count} ramps más{Fore.CYAN}")
+        
+        out.append(Fore.YELLOW + _SECTION_END + Style.RESET_ALL)
         
-        print(Fore.YELLOW + "└" + "─" * 59 + "┘" + Style.RESET_ALL)
+        out.append("\n" + Fore.CYAN + _REPORT_END + Style.RESET_ALL)
         
-        print("\n" + Fore.CYAN + "═" * 60 + Style.RESET_ALL)
+        # Una sola escritura en lugar de un print() por línea
+        print("\n".join(out))
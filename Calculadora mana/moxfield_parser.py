@@ -3,15 +3,44 @@ Módulo para parsear archivos exportados desde Moxfield.
 Soporta formatos CSV y texto plano.
 """
 
-import csv
-from typing import List, Dict
+from typing import List, NamedTuple
 import os
+import re
+
+from card_names import normalize_card_name
+
+
+# Columnas del CSV de Moxfield que se leen (el resto se ignora)
+MOXFIELD_CSV_COLUMNS = frozenset({
+    'Count', 'Quantity', 'Name', 'Type', 'Edition', 'Cost', 'CMC', 'Color', 'Board'
+})
+
+# Boards que se consideran parte del mazo
+DECK_BOARDS = ['mainboard', 'commander', '']
+
+# Prefijos de comentario en listas de texto plano
+COMMENT_PREFIXES = ('#', '//')
+
+# Línea "Cantidad Nombre" o "Cantidadx Nombre", ej: "4 Sol Ring", "1x Island"
+_LINE_RE = re.compile(r'(\d+)[xX]?\s+(\S.*)')
+
+
+class Card(NamedTuple):
+    """Entrada de un mazo (las listas de texto plano solo traen cantidad y nombre)."""
+    quantity: int = 1
+    name: str = ''
+    type: str = ''
+    set: str = ''
+    mana_cost: str = ''
+    cmc: float = 0
+    color: str = ''
+    board: str = 'mainboard'
 
 
 class MoxfieldParser:
     
     @staticmethod
-    def parse_csv(filepath: str) -> List[Dict]:
+    def parse_csv(filepath: str) -> List[Card]:
         """
         Parsea un archivo CSV exportado desde Moxfield.
         
@@ -19,32 +48,45 @@ class MoxfieldParser:
             filepath: Ruta al archivo CSV
         
         Returns:
-            Lista de diccionarios con información de las cartas
+            Lista de cartas (Card)
         """
-        cards = []
+        # pandas solo se importa al leer un CSV (tarda en cargar)
+        import pandas as pd
         
         try:
-            with open(filepath, 'r', encoding='utf-8') as file:
-                # Moxfield CSV tiene headers
-                reader = csv.DictReader(file)
-                
-                for row in reader:
-                    # Moxfield exporta con estas columnas principales
-                    card = {
-                        'quantity': int(row.get('Count', row.get('Quantity', 1))),
-                        'name': row.get('Name', '').strip(),
-                        'type': row.get('Type', ''),
-                        'set': row.get('Edition', ''),
-                        'mana_cost': row.get('Cost', ''),
-                        'cmc': row.get('CMC', 0),
-                        'color': row.get('Color', ''),
-                        'board': row.get('Board', 'mainboard'),  # mainboard, sideboard, commander
-                    }
-                    
-                    # Filtrar solo las del mainboard y commander
-                    if card['board'].lower() in ['mainboard', 'commander', '']:
-                        cards.append(card)
+            # Moxfield CSV tiene headers; todo se lee como texto, vacío = ''
+            df = pd.read_csv(
+                filepath,
+                encoding='utf-8',
+                dtype=str,
+                keep_default_na=False,
+                usecols=lambda column: column in MOXFIELD_CSV_COLUMNS,
+            )
+            
+            def column(name: str, default):
+                if name in df.columns:
+                    return df[name]
+                return pd.Series(default, index=df.index, dtype=object)
+            
+            # Moxfield exporta con estas columnas principales
+            quantity = df['Count'] if 'Count' in df.columns else column('Quantity', 1)
+            cards = pd.DataFrame({
+                'quantity': quantity.astype(int),
+                'name': column('Name', '').map(normalize_card_name),
+                'type': column('Type', ''),
+                'set': column('Edition', ''),
+                'mana_cost': column('Cost', ''),
+                'cmc': column('CMC', 0),
+                'color': column('Color', ''),
+                'board': column('Board', 'mainboard'),  # mainboard, sideboard, commander
+            })
+            
+            # Filtrar solo las del mainboard y commander
+            cards = cards[cards['board'].str.lower().isin(DECK_BOARDS)]
         
+        except pd.errors.EmptyDataError:
+            # Archivo vacío: no hay cartas
+            return []
         except FileNotFoundError:
             print(f"❌ Archivo no encontrado: {filepath}")
             return []
@@ -52,66 +94,51 @@ class MoxfieldParser:
             print(f"❌ Error al leer archivo CSV: {e}")
             return []
         
-        return cards
+        # Las columnas están en el mismo orden que los campos de Card
+        return [Card(*row) for row in cards.itertuples(index=False, name=None)]
     
     @staticmethod
-    def parse_text(filepath: str) -> List[Dict]:
+    def parse_text(filepath: str) -> List[Card]:
         """
         Parsea un archivo de texto plano con formato "Cantidad Nombre".
         Ejemplo:
         1 Omnath, Locus of the Roil
         37 Island
+        1x Sol Ring
         
         Args:
             filepath: Ruta al archivo de texto
         
         Returns:
-            Lista de diccionarios con información de las cartas
+            Lista de cartas (Card)
         """
         cards = []
         
         try:
+            # Leer todo de una vez y descartar líneas vacías y comentarios
             with open(filepath, 'r', encoding='utf-8') as file:
-                for line in file:
-                    line = line.strip()
-                    
-                    # Ignorar líneas vacías y comentarios
-                    if not line or line.startswith('#') or line.startswith('//'):
-                        continue
-                    
-                    # Formato: "Cantidad Nombre de la Carta"
-                    parts = line.split(maxsplit=1)
+                lines = [line for line in (raw.strip() for raw in file.read().split('\n'))
+                         if line and not line.startswith(COMMENT_PREFIXES)]
+            
+            for line in lines:
+                # Formato: "Cantidad Nombre de la Carta" (caso común, una sola regex)
+                match = _LINE_RE.fullmatch(line)
+                if match:
+                    cards.append(Card(int(match.group(1)), normalize_card_name(match.group(2))))
+                    continue
+                
+                parts = line.split(maxsplit=1)
+                
+                if len(parts) >= 2:
+                    try:
+                        quantity = int(parts[0])
+                        name = parts[1].strip()
+                    except ValueError:
+                        # Si la primera parte no es un número, asumir cantidad 1
+                        quantity = 1
+                        name = line
                     
-                    if len(parts) >= 2:
-                        try:
-                            quantity = int(parts[0])
-                            name = parts[1].strip()
-                            
-                            card = {
-                                'quantity': quantity,
-                                'name': name,
-                                'type': '',
-                                'set': '',
-                                'mana_cost': '',
-                                'cmc': 0,
-                                'color': '',
-                                'board': 'mainboard',
-                            }
-                            
-                            cards.append(card)
-                        except ValueError:
-                            # Si la primera parte no es un número, asumir cantidad 1
-                            card = {
-                                'quantity': 1,
-                                'name': line,
-                                'type': '',
-                                'set': '',
-                                'mana_cost': '',
-                                'cmc': 0,
-                                'color': '',
-                                'board': 'mainboard',
-                            }
-                            cards.append(card)
+                    cards.append(Card(quantity, normalize_card_name(name)))
         
         except FileNotFoundError:
             print(f"❌ Archivo no encontrado: {filepath}")
@@ -123,7 +150,7 @@ class MoxfieldParser:
         return cards
     
     @staticmethod
-    def load_deck(filepath: str) -> List[Dict]:
+    def load_deck(filepath: str) -> List[Card]:
         """
         Carga un mazo desde un archivo (detecta automáticamente el formato).
         
@@ -131,7 +158,7 @@ class MoxfieldParser:
             filepath: Ruta al archivo
         
         Returns:
-            Lista de diccionarios con información de las cartas
+            Lista de cartas (Card)
         """
         if not os.path.exists(filepath):
             print(f"❌ Archivo no encontrado: {filepath}")
@@ -151,12 +178,12 @@ class MoxfieldParser:
             return MoxfieldParser.parse_text(filepath)
     
     @staticmethod
-    def get_card_list(cards: List[Dict]) -> List[str]:
+    def get_card_list(cards: List[Card]) -> List[str]:
         """
         Extrae una lista de nombres de cartas (expandiendo cantidades).
         
         Args:
-            cards: Lista de diccionarios de cartas
+            cards: Lista de cartas (Card)
         
         Returns:
             Lista de nombres de cartas individuales
@@ -164,30 +191,20 @@ class MoxfieldParser:
         card_list = []
         
         for card in cards:
-            quantity = card.get('quantity', 1)
-            name = card.get('name', '')
-            
-            for _ in range(quantity):
-                card_list.append(name)
+            # Todas las copias de una vez
+            card_list.extend([card.name] * card.quantity)
         
         return card_list
     
     @staticmethod
-    def get_unique_cards(cards: List[Dict]) -> List[str]:
+    def get_unique_cards(cards: List[Card]) -> List[str]:
         """
         Obtiene lista de nombres únicos de cartas (sin duplicados).
         
         Args:
-            cards: Lista de diccionarios de cartas
+            cards: Lista de cartas (Card)
         
         Returns:
-            Lista de nombres únicos
+            Lista de nombres únicos, en el orden en que aparecen en el mazo
         """
-        unique_names = set()
-        
-        for card in cards:
-            name = card.get('name', '')
-            if name:
-                unique_names.add(name)
-        
-        return list(unique_names)
+        return list(dict.fromkeys(card.name for card in cards if card.name))
@@ -3,28 +3,320 @@ Módulo para interactuar con la API de Scryfall.
 Obtiene información de cartas de Magic: The Gathering.
 """
 
+import json
+import os
+import pickle
+import re
 import requests
+import threading
 import time
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from requests.adapters import HTTPAdapter
+from typing import Dict, List, Optional, Tuple
+
+from card_names import normalize_card_name
+
+
+# Orden de prioridad de tipos para cartas con múltiples tipos
+TYPE_PRIORITY = ('Land', 'Creature', 'Planeswalker', 'Artifact',
+                 'Enchantment', 'Instant', 'Sorcery')
+
+# Caché en disco de las cartas ya procesadas por extract_card_info
+CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'mana_calc', 'cards.pkl')
+# Subir este número al cambiar los campos de extract_card_info (o cómo se
+# calculan) para invalidar la caché
+CACHE_SCHEMA_VERSION = 2
+# Segundos que vale una carta guardada (después se vuelve a pedir: erratas, oracle)
+CARD_TTL = 7 * 24 * 60 * 60
+# Segundos que se recuerda que Scryfall no encontró un nombre (404)
+NOT_FOUND_TTL = 24 * 60 * 60
+
+# Consultas simultáneas a Scryfall (el rate limit sigue repartiendo los inicios)
+MAX_WORKERS = 8
+
+# Cada cuántas cartas se actualiza la línea de progreso
+PROGRESS_EVERY = 10
+
+# Requests que se pueden lanzar seguidas antes de esperar al rate limit
+RATE_LIMIT_BURST = 10
+# Reintentos cuando Scryfall responde 429 (Too Many Requests)
+MAX_RETRIES = 3
+
+# Máximo de identificadores que acepta /cards/collection por request
+COLLECTION_BATCH_SIZE = 75
+
+# Frases del texto de reglas (en minúsculas) que indican ramp
+RAMP_KEYWORDS = (
+    'add {',
+    'search your library for a land',
+    'search your library for a basic land',
+    'search your library for up to',
+    'put a land card',
+    'land card from your library',
+    'untap target land',
+    'lands you control',
+)
+
+# Todas las frases en una sola expresión: una pasada por el texto
+_RAMP_RE = re.compile('|'.join(map(re.escape, RAMP_KEYWORDS)))
+
+# Archivo bulk de Scryfall con una entrada por carta (no por impresión)
+BULK_TYPE = 'oracle_cards'
+BULK_PATH = os.path.join(os.path.dirname(CACHE_PATH), 'oracle-cards.json')
+
+# Campos del bulk que usa extract_card_info; el índice en disco guarda solo estos
+BULK_FIELDS = ('name', 'mana_cost', 'cmc', 'type_line', 'colors', 'color_identity',
+               'oracle_text', 'card_faces')
+BULK_FACE_FIELDS = ('name', 'mana_cost', 'type_line', 'oracle_text')
+# Versión del índice del bulk: cambia sola al tocar los campos que se guardan
+BULK_INDEX_VERSION = (BULK_FIELDS, BULK_FACE_FIELDS)
+
+
+def get_type_rank(type_line: str) -> int:
+    """
+    Retorna la posición del tipo principal de una carta en TYPE_PRIORITY.
+    Ejemplo: "Artifact Creature — Golem" -> 1 (Creature)
+    
+    Returns:
+        Índice en TYPE_PRIORITY, o len(TYPE_PRIORITY) si no tiene tipo reconocido
+    """
+    for rank, card_type in enumerate(TYPE_PRIORITY):
+        if card_type in type_line:
+            return rank
+    return len(TYPE_PRIORITY)
 
 
 class ScryfallAPI:
     BASE_URL = "https://api.scryfall.com"
     
-    def __init__(self):
+    def __init__(self, cache_path: Optional[str] = CACHE_PATH):
         self.session = requests.Session()
-        self.last_request_time = 0
-        self.min_request_interval = 0.1  # 100ms entre requests (Scryfall pide 50-100ms)
+        # Una conexión keep-alive por hilo: cada worker reutiliza la suya (un
+        # solo handshake TLS) en vez de abrir otra cuando el pool se llena
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MAX_WORKERS)
+        self.session.mount('https://', adapter)
+        self.min_request_interval = 0.1  # 100ms de media entre requests (10 req/s)
+        self._tokens = float(RATE_LIMIT_BURST)  # Token bucket del rate limit
+        self._last_refill = time.monotonic()
+        self._rate_lock = threading.Lock()  # Las consultas pueden venir de varios hilos
+        self.cache_path = cache_path  # None desactiva la caché en disco
+        self._cache = None  # Se lee de disco una sola vez, ver _load_cache()
+        self._cached_at = {}  # {nombre: momento en que se guardó en la caché}
+        self._not_found = {}  # {nombre: momento del 404}
+        self._bulk = {}  # {nombre en minúsculas: datos_scryfall}, ver load_bulk()
+    
+    def _load_cache(self) -> Dict[str, Dict]:
+        """
+        Carga la caché de cartas desde disco (solo la primera vez; después
+        reutiliza la de memoria). Descarta las cartas guardadas hace más de
+        CARD_TTL y recupera los nombres que dieron 404 hace menos de
+        NOT_FOUND_TTL, para no volver a pedirlos.
+        
+        Returns:
+            Diccionario {nombre: info_carta}, vacío si no hay caché válida
+        """
+        if self._cache is not None:
+            return self._cache
+        
+        self._cache = {}
+        if not self.cache_path:
+            return self._cache
+        
+        try:
+            with open(self.cache_path, 'rb') as f:
+                data = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return self._cache
+        
+        if not isinstance(data, dict) or data.get('version') != CACHE_SCHEMA_VERSION:
+            return self._cache
+        
+        now = time.time()
+        cached_at = data.get('cached_at', {})
+        self._cache = {name: info for name, info in data.get('by_name', {}).items()
+                       if now - cached_at.get(name, 0) < CARD_TTL}
+        self._cached_at = {name: cached_at[name] for name in self._cache}
+        # Mezclar con los 404 registrados antes de leer la caché (get_card_by_name)
+        self._not_found = {**{name: when for name, when in data.get('not_found', {}).items()
+                              if now - when < NOT_FOUND_TTL},
+                           **self._not_found}
+        return self._cache
+    
+    def _save_cache(self, cards: Dict[str, Dict]):
+        """Guarda la caché de cartas en disco (escritura atómica)."""
+        if not self.cache_path:
+            return
+        
+        tmp_path = self.cache_path + '.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                pickle.dump({'version': CACHE_SCHEMA_VERSION, 'by_name': cards,
+                             'cached_at': self._cached_at, 'not_found': self._not_found},
+                            f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"⚠️  No se pudo guardar la caché de cartas: {e}")
+    
+    def load_bulk(self, bulk_path: str = BULK_PATH) -> bool:
+        """
+        Carga el archivo bulk de Scryfall para resolver cartas sin pedirlas
+        una a una. Lo descarga solo si no existe o si Scryfall publicó uno
+        más nuevo (se actualiza una vez al día, ~160 MB).
+        
+        Args:
+            bulk_path: Ruta donde se guarda el archivo bulk
+        
+        Returns:
+            True si quedó cargado, False si no se pudo
+        """
+        try:
+            self._download_bulk(bulk_path)
+        except (requests.exceptions.RequestException, OSError, ValueError) as e:
+            # Sin conexión se usa el archivo que ya haya en disco
+            print(f"⚠️  No se pudo actualizar el archivo bulk de Scryfall: {e}")
+        
+        # El JSON solo se parsea cuando cambia; después se lee el índice
+        index_path = os.path.splitext(bulk_path)[0] + '.pkl'
+        bulk = self._load_bulk_index(index_path, bulk_path)
+        
+        if bulk is None:
+            try:
+                with open(bulk_path, 'r', encoding='utf-8') as f:
+                    cards = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️  No se pudo leer el archivo bulk de Scryfall: {e}")
+                return False
+            
+            # Indexar por nombre completo y por nombre de cada cara
+            bulk = {}
+            for card_data in cards:
+                card_data = self._trim_bulk_card(card_data)
+                bulk.setdefault(card_data.get('name', '').lower(), card_data)
+                for face in card_data.get('card_faces', []):
+                    bulk.setdefault(face.get('name', '').lower(), card_data)
+            
+            self._save_bulk_index(index_path, bulk)
+        
+        self._bulk = bulk
+        return True
+    
+    @staticmethod
+    def _trim_bulk_card(card_data: Dict) -> Dict:
+        """Deja solo los campos de BULK_FIELDS (y BULK_FACE_FIELDS en las caras)."""
+        card = {field: card_data[field] for field in BULK_FIELDS if field in card_data}
+        if 'card_faces' in card:
+            card['card_faces'] = [{field: face[field] for field in BULK_FACE_FIELDS if field in face}
+                                  for face in card['card_faces']]
+        return card
+    
+    def _load_bulk_index(self, index_path: str, bulk_path: str) -> Optional[Dict[str, Dict]]:
+        """
+        Lee el índice del bulk guardado en disco.
+        
+        Returns:
+            {nombre en minúsculas: datos}, o None si falta, es viejo o no es válido
+        """
+        try:
+            if os.path.getmtime(index_path) < os.path.getmtime(bulk_path):
+                return None
+            with open(index_path, 'rb') as f:
+                data = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return None
+        
+        if not isinstance(data, dict) or data.get('version') != BULK_INDEX_VERSION:
+            return None
+        
+        return data.get('by_name')
+    
+    def _save_bulk_index(self, index_path: str, bulk: Dict[str, Dict]):
+        """Guarda el índice del bulk en disco (escritura atómica)."""
+        tmp_path = index_path + '.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump({'version': BULK_INDEX_VERSION, 'by_name': bulk},
+                            f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, index_path)
+        except OSError as e:
+            print(f"⚠️  No se pudo guardar el índice del archivo bulk: {e}")
+    
+    def _download_bulk(self, bulk_path: str):
+        """Descarga el archivo bulk si el de disco está desactualizado."""
+        response = self._request('GET', f"{self.BASE_URL}/bulk-data", timeout=10)
+        response.raise_for_status()
+        
+        entry = next((item for item in response.json().get('data', [])
+                      if item.get('type') == BULK_TYPE), None)
+        if entry is None:
+            return
+        
+        updated_at = datetime.fromisoformat(entry['updated_at']).timestamp()
+        if os.path.exists(bulk_path) and os.path.getmtime(bulk_path) >= updated_at:
+            return
+        
+        size_mb = entry.get('size', 0) / (1 << 20)
+        print(f"📦 Descargando datos de Scryfall ({size_mb:.0f} MB)...")
+        
+        os.makedirs(os.path.dirname(bulk_path) or '.', exist_ok=True)
+        tmp_path = bulk_path + '.tmp'
+        with self.session.get(entry['download_uri'], stream=True, timeout=60) as download:
+            download.raise_for_status()
+            with open(tmp_path, 'wb') as f:
+                for chunk in download.iter_content(chunk_size=1 << 20):
+                    f.write(chunk)
+        os.replace(tmp_path, bulk_path)
     
     def _rate_limit(self):
-        """Respeta el rate limit de Scryfall."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
+        """
+        Respeta el rate limit de Scryfall (también entre hilos) con un token
+        bucket: permite ráfagas de hasta RATE_LIMIT_BURST requests y de media
+        una cada min_request_interval.
+        """
+        if self.min_request_interval <= 0:
+            return
         
-        if time_since_last < self.min_request_interval:
-            time.sleep(self.min_request_interval - time_since_last)
+        rate = 1 / self.min_request_interval
         
-        self.last_request_time = time.time()
+        with self._rate_lock:
+            now = time.monotonic()
+            self._tokens = min(RATE_LIMIT_BURST, self._tokens + (now - self._last_refill) * rate)
+            self._last_refill = now
+            
+            if self._tokens < 1:
+                # Esperar a que se recargue el token que falta
+                time.sleep((1 - self._tokens) / rate)
+                self._tokens = 1.0
+                self._last_refill = time.monotonic()
+            
+            self._tokens -= 1
+    
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Hace una request respetando el rate limit. Si Scryfall responde 429,
+        espera (Retry-After o 1s, 2s, 4s...) y reintenta hasta MAX_RETRIES veces.
+        
+        Args:
+            method: Método HTTP ('GET', 'POST')
+            url: URL completa
+            **kwargs: Argumentos para requests (params, json, timeout...)
+        
+        Returns:
+            La última respuesta recibida
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            self._rate_limit()
+            response = self.session.request(method, url, **kwargs)
+            
+            if response.status_code != 429 or attempt == MAX_RETRIES:
+                return response
+            
+            try:
+                delay = float(response.headers.get('Retry-After', ''))
+            except ValueError:
+                delay = 2 ** attempt
+            time.sleep(delay)
     
     def get_card_by_name(self, card_name: str) -> Optional[Dict]:
         """
@@ -36,18 +328,24 @@ class ScryfallAPI:
         Returns:
             Diccionario con datos de la carta o None si no se encuentra
         """
-        self._rate_limit()
+        query = normalize_card_name(card_name)
+        
+        # Con el archivo bulk cargado, los nombres exactos no tocan la red
+        card_data = self._bulk.get(query.lower())
+        if card_data:
+            return card_data
         
         url = f"{self.BASE_URL}/cards/named"
-        params = {"fuzzy": card_name}
+        params = {"fuzzy": query}
         
         try:
-            response = self.session.get(url, params=params, timeout=10)
+            response = self._request('GET', url, params=params, timeout=10)
             
             if response.status_code == 200:
                 return response.json()
             elif response.status_code == 404:
                 print(f"⚠️  Carta no encontrada: {card_name}")
+                self._not_found[card_name] = time.time()
                 return None
             else:
                 print(f"⚠️  Error al buscar {card_name}: {response.status_code}")
@@ -57,6 +355,48 @@ class ScryfallAPI:
             print(f"⚠️  Error de conexión al buscar {card_name}: {e}")
             return None
     
+    def get_cards_collection(self, card_names: list) -> Dict[str, Dict]:
+        """
+        Obtiene varias cartas por nombre exacto usando /cards/collection
+        (hasta COLLECTION_BATCH_SIZE nombres por request).
+        
+        Args:
+            card_names: Lista de nombres de cartas
+        
+        Returns:
+            Diccionario {nombre: datos_scryfall} solo con las cartas encontradas
+        """
+        url = f"{self.BASE_URL}/cards/collection"
+        found = {}
+        
+        for start in range(0, len(card_names), COLLECTION_BATCH_SIZE):
+            batch = card_names[start:start + COLLECTION_BATCH_SIZE]
+            payload = {'identifiers': [{'name': card_name} for card_name in batch]}
+            
+            try:
+                response = self._request('POST', url, json=payload, timeout=30)
+            except requests.exceptions.RequestException as e:
+                print(f"⚠️  Error de conexión en la consulta por lotes: {e}")
+                continue
+            
+            if response.status_code != 200:
+                print(f"⚠️  Error en la consulta por lotes: {response.status_code}")
+                continue
+            
+            # Emparejar por nombre completo o por nombre de cualquiera de sus caras
+            by_name = {}
+            for card_data in response.json().get('data', []):
+                by_name[card_data.get('name', '').lower()] = card_data
+                for face in card_data.get('card_faces', []):
+                    by_name.setdefault(face.get('name', '').lower(), card_data)
+            
+            for card_name in batch:
+                card_data = by_name.get(card_name.lower())
+                if card_data:
+                    found[card_name] = card_data
+        
+        return found
+    
     def extract_card_info(self, card_data: Dict) -> Dict:
         """
         Extrae información relevante de los datos de Scryfall.
@@ -68,9 +408,7 @@ class ScryfallAPI:
             Diccionario con información simplificada
         """
         # Manejo de cartas dobles (DFC, split, etc.)
-        card_faces = card_data.get('card_faces', [])
-        
-        if card_faces:
+        if card_faces := card_data.get('card_faces'):
             # Para cartas con múltiples caras, usar la primera cara
             face = card_faces[0]
             mana_cost = face.get('mana_cost', '')
@@ -79,6 +417,10 @@ class ScryfallAPI:
             mana_cost = card_data.get('mana_cost', '')
             type_line = card_data.get('type_line', '')
         
+        type_rank = get_type_rank(type_line)
+        types, subtypes = self._parse_type_line(type_line)
+        oracle_text = card_data.get('oracle_text', '')
+        
         info = {
             'name': card_data.get('name', ''),
             'mana_cost': mana_cost,
@@ -86,83 +428,120 @@ class ScryfallAPI:
             'type_line': type_line,
             'colors': card_data.get('colors', []),
             'color_identity': card_data.get('color_identity', []),
-            'oracle_text': card_data.get('oracle_text', ''),
-            'is_land': 'Land' in type_line,
-            'is_creature': 'Creature' in type_line,
-            'types': self._extract_types(type_line),
-            'subtypes': self._extract_subtypes(type_line),
+            'oracle_text': oracle_text,
+            'is_land': 'Land' in types,
+            'is_creature': 'Creature' in types,
+            'types': types,
+            'subtypes': subtypes,
+            'type_rank': type_rank,
+            'primary_type': TYPE_PRIORITY[type_rank] if type_rank < len(TYPE_PRIORITY) else 'Other',
         }
         
         # Detectar si es ramp (produce o busca maná)
-        oracle_text = card_data.get('oracle_text', '').lower()
-        info['is_ramp'] = self._is_ramp_card(oracle_text, type_line)
+        info['is_ramp'] = self._is_ramp_card(oracle_text.lower(), types)
         
         return info
     
-    def _extract_types(self, type_line: str) -> list:
-        """Extrae los tipos principales de una carta."""
-        if '—' in type_line:
-            main_types = type_line.split('—')[0].strip()
-        else:
-            main_types = type_line
+    @staticmethod
+    def _parse_type_line(type_line: str) -> Tuple[List[str], List[str]]:
+        """
+        Separa la línea de tipo en tipos principales y subtipos.
+        Ejemplo: "Legendary Creature — Elf Druid" -> (['Legendary', 'Creature'], ['Elf', 'Druid'])
         
-        return [t.strip() for t in main_types.split() if t.strip()]
-    
-    def _extract_subtypes(self, type_line: str) -> list:
-        """Extrae los subtipos de una carta."""
-        if '—' in type_line:
-            subtypes = type_line.split('—')[1].strip()
-            return [s.strip() for s in subtypes.split() if s.strip()]
-        return []
+        Returns:
+            Tupla (tipos, subtipos)
+        """
+        parts = type_line.split('—')
+        types = parts[0].split()
+        subtypes = parts[1].split() if len(parts) > 1 else []
+        return types, subtypes
     
-    def _is_ramp_card(self, oracle_text: str, type_line: str) -> bool:
+    def _is_ramp_card(self, oracle_text_lower: str, types: List[str]) -> bool:
         """
         Detecta si una carta es de ramp (acelera el maná).
+        
+        Args:
+            oracle_text_lower: Texto de reglas ya en minúsculas
+            types: Tipos principales ya separados (ver _parse_type_line)
         """
-        if 'Land' in type_line:
+        if 'Land' in types:
             return False  # Las tierras no cuentan como ramp
         
-        ramp_keywords = [
-            'add {',
-            'search your library for a land',
-            'search your library for a basic land',
-            'search your library for up to',
-            'put a land card',
-            'land card from your library',
-            'untap target land',
-            'lands you control',
-        ]
-        
-        return any(keyword in oracle_text for keyword in ramp_keywords)
+        return _RAMP_RE.search(oracle_text_lower) is not None
     
     def get_multiple_cards(self, card_names: list) -> Dict[str, Dict]:
         """
         Obtiene información de múltiples cartas.
+        Los nombres repetidos se consultan una sola vez.
         
         Args:
-            card_names: Lista de nombres de cartas
+            card_names: Lista de nombres de cartas (puede tener repetidos)
         
         Returns:
-            Diccionario {nombre: info_carta}
+            Diccionario {nombre: info_carta} con un elemento por nombre distinto
         """
         cards_info = {}
+        # Sin repetidos y en el orden original
+        card_names = list(dict.fromkeys(card_names))
         total = len(card_names)
+        cache = self._load_cache()
+        cache_updated = False
+        known_not_found = len(self._not_found)
         
         print(f"\n🔍 Consultando Scryfall para {total} cartas...")
         
-        for i, card_name in enumerate(card_names, 1):
-            print(f"   [{i}/{total}] {card_name}...", end='\r')
-            
-            card_data = self.get_card_by_name(card_name)
+        # Las cartas ya procesadas en otra sesión no se vuelven a pedir;
+        # el resto sale del archivo bulk (si está cargado) o se pide por
+        # lotes de nombres exactos
+        missing = [card_name for card_name in card_names if card_name not in cache]
+        fetched = {card_name: self._bulk[card_name.lower()]
+                   for card_name in missing if card_name.lower() in self._bulk}
+        
+        # Los nombres que ya dieron 404 hace poco no se vuelven a pedir
+        to_request = [card_name for card_name in missing
+                      if card_name not in fetched and card_name not in self._not_found]
+        fetched.update(self.get_cards_collection(
+            [card_name for card_name in to_request if card_name.strip()]))
+        
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            # Las que no salieron en los lotes (nombre no exacto, error) se buscan
+            # por nombre aproximado, lanzadas de una vez para solapar la latencia
+            pending = {
+                card_name: executor.submit(self.get_card_by_name, card_name)
+                for card_name in to_request if card_name not in fetched
+            }
             
-            if card_data:
-                cards_info[card_name] = self.extract_card_info(card_data)
-            else:
-                # Agregar entrada vacía para cartas no encontradas
-                cards_info[card_name] = {
-                    'name': card_name,
-                    'error': 'No encontrada'
-                }
+            for i, card_name in enumerate(card_names, 1):
+                # Progreso cada PROGRESS_EVERY cartas (y en la última)
+                if i % PROGRESS_EVERY == 0 or i == total:
+                    print(f"   [{i}/{total}] {card_name}...", end='\r', flush=True)
+                
+                if card_name in cache:
+                    cards_info[card_name] = cache[card_name]
+                    continue
+                
+                if card_name in fetched:
+                    card_data = fetched[card_name]
+                elif card_name in pending:
+                    card_data = pending[card_name].result()
+                else:
+                    print(f"⚠️  Carta no encontrada: {card_name}")
+                    card_data = None
+                
+                if card_data:
+                    cards_info[card_name] = self.extract_card_info(card_data)
+                    cache[card_name] = cards_info[card_name]
+                    self._cached_at[card_name] = time.time()
+                    cache_updated = True
+                else:
+                    # Agregar entrada vacía para cartas no encontradas
+                    cards_info[card_name] = {
+                        'name': card_name,
+                        'error': 'No encontrada'
+                    }
+        
+        if cache_updated or len(self._not_found) != known_not_found:
+            self._save_cache(cache)
         
         print(f"\n✅ Consulta completada: {len(cards_info)} cartas procesadas")
         return cards_info